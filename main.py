@@ -114,7 +114,7 @@ class NOICETradingBot:
             self.logger.error(f"Failed to initialize components: {e}")
             raise
 
-    def _on_trade_event(self, trade_data: dict):
+    async def _on_trade_event(self, trade_data: dict):
         """
         Handle trade events for logging and monitoring.
 
@@ -124,7 +124,7 @@ class NOICETradingBot:
         try:
             # Log trade to database
             if self.database:
-                asyncio.create_task(self.database.log_trade_event(trade_data))
+                await self.database.log_trade_event(trade_data)
 
             # Send alerts if configured
             if trade_data["action"] in ["open_position", "stop_loss"]:
@@ -14,7 +14,7 @@ from abc import ABC, abstractmethod
 import logging
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class OHLCVData:
     """OHLCV (Open, High, Low, Close, Volume) data structure."""
 
@@ -39,7 +39,7 @@ class OHLCVData:
         }
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TickerData:
     """Real-time ticker data."""
 
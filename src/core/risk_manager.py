@@ -19,7 +19,7 @@ class PositionStatus(Enum):
     PARTIAL = "PARTIAL"
 
 
-@dataclass
+@dataclass(slots=True)
 class Position:
     """
     Represents an open trading position.
@@ -146,12 +146,21 @@ class RiskManager:
         self.positions: Dict[str, Position] = {}
         self.position_history: List[Position] = []
 
+        # Bumped whenever a symbol is added to or removed from `positions`,
+        # so callers can cache snapshots of the open symbols between changes
+        self._positions_version = 0
+
         # Risk metrics
         self.total_trades = 0
         self.winning_trades = 0
         self.total_fees = 0.0
         self.max_historical_capital = initial_capital
 
+    @property
+    def positions_version(self) -> int:
+        """Counter that changes whenever a position is opened or fully closed."""
+        return self._positions_version
+
     def can_open_position(self, signal: TradingSignal) -> bool:
         """
         Check if new position can be opened based on risk limits.
@@ -260,6 +269,7 @@ class RiskManager:
         )
 
         self.positions[signal.symbol] = position
+        self._positions_version += 1
         self.total_trades += 1
 
         return position
@@ -375,6 +385,7 @@ class RiskManager:
             position.status = PositionStatus.CLOSED
             self.position_history.append(position)
             del self.positions[symbol]
+            self._positions_version += 1
 
         return position
 
@@ -5,7 +5,7 @@ Defines the contract for all trading strategies.
 
 from abc import ABC, abstractmethod
 from typing import Optional, List, Dict, Any
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 
@@ -29,10 +29,11 @@ class PositionSide(Enum):
     SHORT = "SHORT"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TradingSignal:
     """
     Trading signal with all necessary information for execution.
+    Signals are treated as immutable once generated.
     """
 
     signal_type: SignalType
@@ -46,9 +47,26 @@ class TradingSignal:
     reason: str
     timestamp: datetime
     metadata: Dict[str, Any] = None
+    _dict_cache: Optional[Dict[str, Any]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def to_dict(self) -> Dict[str, Any]:
-        """Convert signal to dictionary for storage/transmission."""
+        """
+        Convert signal to dictionary for storage/transmission.
+
+        The dictionary is built once and cached; each call returns a fresh
+        shallow copy (with its own metadata dict) so callers that modify the
+        result do not change the signal or other callers' copies.
+        """
+        if self._dict_cache is None:
+            object.__setattr__(self, "_dict_cache", self._build_dict())
+        data = dict(self._dict_cache)
+        data["metadata"] = dict(data["metadata"])
+        return data
+
+    def _build_dict(self) -> Dict[str, Any]:
+        """Build the dictionary returned by to_dict."""
         return {
             "signal_type": self.signal_type.value,
             "symbol": self.symbol,
@@ -100,6 +118,20 @@ class StrategyInterface(ABC):
         """
         pass
 
+    def update_batch(self, bars: List[OHLCVData]) -> List[Optional[TradingSignal]]:
+        """
+        Process several OHLCV bars in order.
+
+        Strategies can override this to share indicator work across the batch.
+
+        Args:
+            bars: OHLCV data points, oldest first
+
+        Returns:
+            One entry per bar: TradingSignal if conditions met, None otherwise
+        """
+        return [self.update(ohlcv) for ohlcv in bars]
+
     @abstractmethod
     def get_required_history(self) -> int:
         """
@@ -229,8 +261,18 @@ class BaseStrategy(StrategyInterface):
             return None
 
         # Generate signal using strategy-specific logic
-        signal = self._generate_signal()
+        return self._accept_signal(self._generate_signal())
+
+    def _accept_signal(self, signal: Optional[TradingSignal]) -> Optional[TradingSignal]:
+        """
+        Apply the confidence threshold and record accepted signals.
 
+        Args:
+            signal: Candidate signal from the strategy
+
+        Returns:
+            The signal if accepted, None otherwise
+        """
         if signal and signal.confidence >= self.parameters.min_confidence:
             self.last_signal_time = datetime.now()
             self.log_signal(signal)
@@ -4,9 +4,11 @@ Coordinates market data, strategy signals, and trade execution.
 """
 
 import asyncio
+import inspect
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Optional, Dict, Any, List, Callable
+from typing import Optional, Dict, Any, List, Callable, Tuple
 
 from .config_manager import ConfigManager
 from .market_data import MarketDataHandler, OHLCVData, TickerData
@@ -27,26 +29,49 @@ class TradingEngine:
     - Provide real-time monitoring
     """
 
-    def __init__(self, config_manager: ConfigManager):
+    def __init__(self, config_manager: ConfigManager, bar_batch_size: int = 1):
+        """
+        Initialize the trading engine.
+
+        Args:
+            config_manager: Configuration source
+            bar_batch_size: OHLCV bars to buffer before running the strategy;
+                keep at 1 for live trading, raise it for backtests
+        """
         self.config = config_manager
         self.logger = logging.getLogger(__name__)
 
-        # Initialize components
-        self.market_data: Optional[MarketDataHandler] = None
-        self.strategy: Optional[NOICEStrategy] = None
-        self.risk_manager: Optional[RiskManager] = None
-
         # State tracking
         self.is_running = False
         self.is_trading_enabled = True
         self.last_signal: Optional[TradingSignal] = None
         self.trade_callbacks: List[Callable] = []
 
+        # Trade callbacks run off the market data path; a single worker keeps
+        # events for the same position in order
+        self._callback_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="trade-cb"
+        )
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Cached tuple of open position symbols, rebuilt only when the risk
+        # manager reports that the set of positions has changed
+        self._positions_snapshot: Tuple[str, ...] = ()
+        self._positions_snapshot_ver = -1
+
+        # OHLCV bars waiting to be handed to the strategy as one batch;
+        # partial batches are flushed after _bar_flush_interval seconds
+        self._bar_buffer: List[OHLCVData] = []
+        self._bar_buffer_max = max(1, bar_batch_size)
+        self._bar_flush_interval = 0.1
+        self._bar_flush_handle: Optional[asyncio.TimerHandle] = None
+
         # Performance metrics
         self.signals_generated = 0
         self.trades_executed = 0
         self.start_time: Optional[datetime] = None
 
+        # Initialize components; construction fails if any of them cannot be set up
         self._setup_components()
 
     def _setup_components(self):
@@ -56,17 +81,17 @@ class TradingEngine:
             trading_config = self.config.get_trading_config()
 
             # Initialize market data handler
-            self.market_data = MarketDataHandler(
+            self.market_data: MarketDataHandler = MarketDataHandler(
                 symbol=trading_config.symbol,
                 primary_exchange="mexc",
                 backup_exchange="binance",
             )
 
             # Initialize strategy
-            self.strategy = NOICEStrategy(symbol=trading_config.symbol)
+            self.strategy: NOICEStrategy = NOICEStrategy(symbol=trading_config.symbol)
 
             # Initialize risk manager
-            self.risk_manager = RiskManager(
+            self.risk_manager: RiskManager = RiskManager(
                 initial_capital=trading_config.capital,
                 max_risk_per_trade=trading_config.max_position_pct,
                 max_portfolio_risk=0.10,  # 10% max portfolio risk
@@ -81,7 +106,7 @@ class TradingEngine:
             self.logger.info("Trading engine components initialized successfully")
 
         except Exception as e:
-            self.logger.error(f"Failed to setup trading components: {e}")
+            self.logger.error("Failed to setup trading components: %s", e)
             raise
 
     def _on_market_data(self, ohlcv: OHLCVData):
@@ -91,28 +116,77 @@ class TradingEngine:
         Args:
             ohlcv: New OHLCV data point
         """
+        if not self.is_trading_enabled:
+            return
+
+        # The bar buffer and flush timer belong to the event loop; bars
+        # delivered from a feed thread are handed over to it
+        loop = self._loop
+        if loop is not None and not self._on_loop_thread():
+            loop.call_soon_threadsafe(self._on_market_data, ohlcv)
+            return
+
+        self._bar_buffer.append(ohlcv)
+
+        if len(self._bar_buffer) >= self._bar_buffer_max:
+            self._flush_bar_buffer()
+        elif self._bar_flush_handle is None and self._loop is not None:
+            # Don't let a partial batch stall on a quiet symbol
+            self._bar_flush_handle = self._loop.call_later(
+                self._bar_flush_interval, self._flush_bar_buffer
+            )
+
+    def _on_loop_thread(self) -> bool:
+        """Check whether the caller is running on the engine's event loop."""
         try:
-            if not self.is_trading_enabled:
-                return
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
 
-            # Update strategy with new data
-            signal = self.strategy.update(ohlcv)
+    def _flush_bar_buffer(self):
+        """Hand all buffered OHLCV bars to the strategy."""
+        if self._bar_flush_handle is not None:
+            self._bar_flush_handle.cancel()
+            self._bar_flush_handle = None
 
-            if signal:
-                self.signals_generated += 1
-                self.last_signal = signal
-                self.logger.info(
-                    f"Signal generated: {signal.signal_type.value} at {signal.price:.6f}"
-                )
+        if not self._bar_buffer:
+            return
 
-                # Process the signal
-                self._process_signal(signal)
+        bars = self._bar_buffer
+        self._bar_buffer = []
+        self._process_bar_batch(bars)
 
-            # Update existing positions with current price
-            self._update_positions(ohlcv.close)
+    def _process_bar_batch(self, bars: List[OHLCVData]):
+        """
+        Run the strategy over a batch of bars and act on the results in order.
+
+        Args:
+            bars: OHLCV data points, oldest first
+        """
+        try:
+            # Update strategy with new data
+            if len(bars) == 1:
+                signals = [self.strategy.update(bars[0])]
+            else:
+                signals = self.strategy.update_batch(bars)
+
+            for ohlcv, signal in zip(bars, signals):
+                if signal:
+                    self.signals_generated += 1
+                    self.last_signal = signal
+                    self.logger.info(
+                        "Signal generated: %s at %.6f", signal.signal_type.value, signal.price
+                    )
+
+                    # Process the signal
+                    self._process_signal(signal)
+
+                # Update existing positions with current price
+                if self.risk_manager.positions:
+                    self._update_positions(ohlcv.close)
 
         except Exception as e:
-            self.logger.error(f"Error processing market data: {e}")
+            self.logger.error("Error processing market data: %s", e)
 
     def _on_ticker_data(self, ticker: TickerData):
         """
@@ -122,7 +196,7 @@ class TradingEngine:
             ticker: Ticker data with current price info
         """
         # Update positions with real-time price data
-        if self.risk_manager:
+        if self.risk_manager.positions:
             self._update_positions(ticker.price)
 
     def _process_signal(self, signal: TradingSignal):
@@ -136,13 +210,13 @@ class TradingEngine:
             # Check if we can open a new position
             if signal.signal_type in [SignalType.BUY, SignalType.SELL]:
                 if not self.risk_manager.can_open_position(signal):
-                    self.logger.warning(f"Cannot open position: Risk limits exceeded")
+                    self.logger.warning("Cannot open position: Risk limits exceeded")
                     return
 
                 # Calculate position size
                 quantity = self.risk_manager.calculate_position_size(signal)
                 if quantity <= 0:
-                    self.logger.warning(f"Invalid position size calculated: {quantity}")
+                    self.logger.warning("Invalid position size calculated: %s", quantity)
                     return
 
                 # Execute the trade
@@ -153,7 +227,7 @@ class TradingEngine:
                 self._close_position(signal.symbol, "manual_close")
 
         except Exception as e:
-            self.logger.error(f"Error processing signal: {e}")
+            self.logger.error("Error processing signal: %s", e)
 
     def _execute_trade(self, signal: TradingSignal, quantity: float):
         """
@@ -168,8 +242,11 @@ class TradingEngine:
             # For now, we'll simulate the trade execution
 
             self.logger.info(
-                f"Executing {signal.signal_type.value} order: "
-                f"{quantity:.6f} {signal.symbol} at {signal.price:.6f}"
+                "Executing %s order: %.6f %s at %.6f",
+                signal.signal_type.value,
+                quantity,
+                signal.symbol,
+                signal.price,
             )
 
             # Open position in risk manager
@@ -178,19 +255,20 @@ class TradingEngine:
             self.trades_executed += 1
 
             # Notify callbacks
-            self._notify_trade_callbacks(
-                {
-                    "action": "open_position",
-                    "signal": signal.to_dict(),
-                    "position": position.to_dict(),
-                    "timestamp": datetime.now(tz=timezone.utc).isoformat(),
-                }
-            )
+            if self.trade_callbacks:
+                self._notify_trade_callbacks(
+                    {
+                        "action": "open_position",
+                        "signal": signal.to_dict(),
+                        "position": position.to_dict(),
+                        "timestamp": datetime.now(tz=timezone.utc).isoformat(),
+                    }
+                )
 
-            self.logger.info(f"Position opened successfully: {position.symbol}")
+            self.logger.info("Position opened successfully: %s", position.symbol)
 
         except Exception as e:
-            self.logger.error(f"Failed to execute trade: {e}")
+            self.logger.error("Failed to execute trade: %s", e)
 
     def _update_positions(self, current_price: float):
         """
@@ -199,12 +277,10 @@ class TradingEngine:
         Args:
             current_price: Current market price
         """
-        if not self.risk_manager or not self.strategy:
+        if not self.risk_manager.positions:
             return
 
-        symbols_to_process = list(self.risk_manager.positions.keys())
-
-        for symbol in symbols_to_process:
+        for symbol in self._position_symbols():
             try:
                 # Update position and check for exit signals
                 exit_action = self.risk_manager.update_position(symbol, current_price)
@@ -213,7 +289,21 @@ class TradingEngine:
                     self._handle_position_exit(symbol, exit_action)
 
             except Exception as e:
-                self.logger.error(f"Error updating position {symbol}: {e}")
+                self.logger.error("Error updating position %s: %s", symbol, e)
+
+    def _position_symbols(self) -> Tuple[str, ...]:
+        """
+        Get a snapshot of open position symbols that is safe to iterate
+        while positions are being closed.
+
+        Returns:
+            Tuple of symbols with open positions
+        """
+        version = self.risk_manager.positions_version
+        if version != self._positions_snapshot_ver:
+            self._positions_snapshot = tuple(self.risk_manager.positions)
+            self._positions_snapshot_ver = version
+        return self._positions_snapshot
 
     def _handle_position_exit(self, symbol: str, exit_action: str):
         """
@@ -236,23 +326,27 @@ class TradingEngine:
             )
 
             if closed_position:
-                self.logger.info(
-                    f"Position {exit_action} triggered for {symbol}: "
-                    f"PnL: {closed_position.get_total_pnl():.2f}"
-                )
+                if self.logger.isEnabledFor(logging.INFO):
+                    self.logger.info(
+                        "Position %s triggered for %s: PnL: %.2f",
+                        exit_action,
+                        symbol,
+                        closed_position.get_total_pnl(),
+                    )
 
                 # Notify callbacks
-                self._notify_trade_callbacks(
-                    {
-                        "action": exit_action,
-                        "symbol": symbol,
-                        "position": closed_position.to_dict(),
-                        "timestamp": datetime.now(tz=timezone.utc).isoformat(),
-                    }
-                )
+                if self.trade_callbacks:
+                    self._notify_trade_callbacks(
+                        {
+                            "action": exit_action,
+                            "symbol": symbol,
+                            "position": closed_position.to_dict(),
+                            "timestamp": datetime.now(tz=timezone.utc).isoformat(),
+                        }
+                    )
 
         except Exception as e:
-            self.logger.error(f"Error handling position exit for {symbol}: {e}")
+            self.logger.error("Error handling position exit for %s: %s", symbol, e)
 
     def _close_position(self, symbol: str, reason: str):
         """
@@ -265,27 +359,67 @@ class TradingEngine:
         if symbol in self.risk_manager.positions:
             closed_position = self.risk_manager.close_position(symbol, reason, 1.0)
             if closed_position:
-                self.logger.info(f"Position manually closed: {symbol} - {reason}")
+                self.logger.info("Position manually closed: %s - %s", symbol, reason)
 
     def _notify_trade_callbacks(self, trade_data: Dict[str, Any]):
         """
-        Notify all registered trade callbacks.
+        Dispatch trade event to all registered callbacks without blocking.
+
+        Sync callbacks run on the callback executor, coroutine callbacks are
+        scheduled on the engine's event loop. Callbacks that are not
+        recognisably async up front (e.g. objects returning a coroutine from
+        a plain __call__) are started on the executor and, if they return an
+        awaitable, it is handed to the loop from there.
 
         Args:
             trade_data: Trade event data
         """
         for callback in self.trade_callbacks:
-            try:
-                callback(trade_data)
-            except Exception as e:
-                self.logger.error(f"Error in trade callback: {e}")
+            if inspect.iscoroutinefunction(callback) or inspect.iscoroutinefunction(
+                getattr(callback, "__call__", None)
+            ):
+                self._schedule_awaitable(callback(trade_data))
+            else:
+                self._callback_executor.submit(self._run_trade_callback, callback, trade_data)
+
+    def _schedule_awaitable(self, awaitable):
+        """Run an awaitable returned by a trade callback on the event loop."""
+        if self._loop is None:
+            self.logger.error("Cannot run async trade callback: engine not started")
+            if inspect.iscoroutine(awaitable):
+                awaitable.close()
+            return
+        if not inspect.iscoroutine(awaitable):
+            awaitable = self._await(awaitable)
+        future = asyncio.run_coroutine_threadsafe(awaitable, self._loop)
+        future.add_done_callback(self._on_callback_done)
+
+    @staticmethod
+    async def _await(awaitable):
+        """Wrap a non-coroutine awaitable so it can be scheduled on the loop."""
+        return await awaitable
+
+    def _run_trade_callback(self, callback: Callable, trade_data: Dict[str, Any]):
+        """Run a sync trade callback, logging any error it raises."""
+        try:
+            result = callback(trade_data)
+        except Exception as e:
+            self.logger.error("Error in trade callback: %s", e)
+            return
+        if inspect.isawaitable(result):
+            self._schedule_awaitable(result)
+
+    def _on_callback_done(self, future):
+        """Log errors raised by async trade callbacks."""
+        if not future.cancelled() and future.exception() is not None:
+            self.logger.error("Error in trade callback: %s", future.exception())
 
     def add_trade_callback(self, callback: Callable[[Dict[str, Any]], None]):
         """
         Add callback for trade events.
 
         Args:
-            callback: Function to call on trade events
+            callback: Function or coroutine function to call on trade events
         """
         self.trade_callbacks.append(callback)
 
@@ -298,17 +432,20 @@ class TradingEngine:
         try:
             self.is_running = True
             self.start_time = datetime.now(tz=timezone.utc)
+            self._loop = asyncio.get_running_loop()
+
+            # Bars received before the loop was known had no flush timer
+            self._flush_bar_buffer()
 
             self.logger.info("Starting trading engine...")
 
             # Start market data feeds
-            if self.market_data:
-                await self.market_data.start()
+            await self.market_data.start()
 
             self.logger.info("Trading engine started successfully")
 
         except Exception as e:
-            self.logger.error(f"Failed to start trading engine: {e}")
+            self.logger.error("Failed to start trading engine: %s", e)
             self.is_running = False
             raise
 
@@ -322,9 +459,18 @@ class TradingEngine:
 
             self.is_running = False
 
+            # Process any bars still waiting for a full batch
+            self._flush_bar_buffer()
+
             # Stop market data feeds
-            if self.market_data:
-                self.market_data.stop()
+            self.market_data.stop()
+
+            # Let queued callbacks finish in the background; a fresh executor
+            # allows the engine to be started again
+            self._callback_executor.shutdown(wait=False)
+            self._callback_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="trade-cb"
+            )
 
             # Close all open positions (optional - for emergency stop)
             # if self.risk_manager:
@@ -334,7 +480,7 @@ class TradingEngine:
             self.logger.info("Trading engine stopped")
 
         except Exception as e:
-            self.logger.error(f"Error stopping trading engine: {e}")
+            self.logger.error("Error stopping trading engine: %s", e)
 
     def enable_trading(self):
         """Enable trade execution."""
@@ -352,14 +498,6 @@ class TradingEngine:
         if self.start_time:
             uptime = (datetime.now(tz=timezone.utc) - self.start_time).total_seconds()
 
-        portfolio_summary = {}
-        if self.risk_manager:
-            portfolio_summary = self.risk_manager.get_portfolio_summary()
-
-        strategy_stats = {}
-        if self.strategy:
-            strategy_stats = self.strategy.get_signal_stats()
-
         return {
             "engine": {
                 "is_running": self.is_running,
@@ -368,17 +506,15 @@ class TradingEngine:
                 "signals_generated": self.signals_generated,
                 "trades_executed": self.trades_executed,
             },
-            "portfolio": portfolio_summary,
-            "strategy": strategy_stats,
+            "portfolio": self.risk_manager.get_portfolio_summary(),
+            "strategy": self.strategy.get_signal_stats(),
             "last_signal": self.last_signal.to_dict() if self.last_signal else None,
             "timestamp": datetime.now(tz=timezone.utc).isoformat(),
         }
 
     def get_active_positions(self) -> List[Dict[str, Any]]:
         """Get all active positions."""
-        if self.risk_manager:
-            return self.risk_manager.get_active_positions()
-        return []
+        return self.risk_manager.get_active_positions()
 
     def force_close_position(self, symbol: str) -> bool:
         """
@@ -391,12 +527,12 @@ class TradingEngine:
             True if position was closed
         """
         try:
-            if self.risk_manager and symbol in self.risk_manager.positions:
+            if symbol in self.risk_manager.positions:
                 self._close_position(symbol, "force_close")
                 return True
             return False
         except Exception as e:
-            self.logger.error(f"Error force closing position {symbol}: {e}")
+            self.logger.error("Error force closing position %s: %s", symbol, e)
             return False
 
     def force_close_all_positions(self) -> int:
@@ -408,10 +544,8 @@ class TradingEngine:
         """
         closed_count = 0
 
-        if self.risk_manager:
-            symbols = list(self.risk_manager.positions.keys())
-            for symbol in symbols:
-                if self.force_close_position(symbol):
-                    closed_count += 1
+        for symbol in self._position_symbols():
+            if self.force_close_position(symbol):
+                closed_count += 1
 
         return closed_count
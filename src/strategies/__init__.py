@@ -1,11 +1,19 @@
 """
 Trading strategies for the bot swarm.
+
+Concrete strategies are imported on first access so that importing the
+package does not load every strategy's dependencies.
 """
 
+from importlib import import_module
+
 from .base_strategy import BaseStrategy, StrategySignal, SignalType
-from .trend_following import TrendFollowingStrategy
-from .mean_reversion import MeanReversionStrategy
-from .momentum import MomentumStrategy
+
+_LAZY_STRATEGIES = {
+    'TrendFollowingStrategy': '.trend_following',
+    'MeanReversionStrategy': '.mean_reversion',
+    'MomentumStrategy': '.momentum',
+}
 
 __all__ = [
     'BaseStrategy',
@@ -15,3 +23,14 @@ __all__ = [
     'MeanReversionStrategy',
     'MomentumStrategy'
 ]
+
+
+def __getattr__(name):
+    """Import concrete strategies on first access (PEP 562)."""
+    module_name = _LAZY_STRATEGIES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    strategy = getattr(import_module(module_name, __name__), name)
+    globals()[name] = strategy
+    return strategy
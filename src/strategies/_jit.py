@@ -0,0 +1,23 @@
+"""
+Optional Numba support for indicator kernels.
+Kernels decorated with `njit` run as plain Python when Numba is not installed.
+"""
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+HAS_NUMBA = njit is not None
+
+if njit is None:
+
+    def njit(*args, **kwargs):
+        """Fallback for numba.njit that returns the function unchanged."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+
+        return decorator
@@ -0,0 +1,413 @@
+"""
+Compiled indicator kernels shared by the strategies.
+All kernels take float64 NumPy arrays and return full-length arrays,
+with NaN where the indicator is not yet defined. Compiled kernels release
+the GIL, so indicators for several symbols can be computed from a thread pool.
+The move_* helpers dispatch to bottleneck when it is installed.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+try:
+    import bottleneck as bn
+except ImportError:
+    bn = None
+
+from ._jit import njit
+
+
+@njit(cache=True, nogil=True)
+def rolling_mean(x, window):
+    """Simple moving average; NaN until `window` valid values are available."""
+    n = x.shape[0]
+    out = np.full(n, np.nan)
+    total = 0.0
+    nans = 0
+
+    for i in range(n):
+        value = x[i]
+        if np.isnan(value):
+            nans += 1
+        else:
+            total += value
+
+        if i >= window:
+            old = x[i - window]
+            if np.isnan(old):
+                nans -= 1
+            else:
+                total -= old
+
+        if i >= window - 1 and nans == 0:
+            out[i] = total / window
+
+    return out
+
+
+@njit(cache=True, nogil=True)
+def bbands_bundle(close, period, num_std):
+    """
+    Bollinger Bands in a single pass using a sliding Welford update.
+    Returns: (middle, std, upper, lower), with sample standard deviation.
+    """
+    n = close.shape[0]
+    middle = np.full(n, np.nan)
+    std = np.full(n, np.nan)
+    mean = 0.0
+    m2 = 0.0
+    # Length of the current run of identical prices; a window made of a
+    # single repeated price has exactly zero variance
+    same_run = 0
+
+    for i in range(n):
+        value = close[i]
+        if i > 0 and value == close[i - 1]:
+            same_run += 1
+        else:
+            same_run = 1
+
+        if i < period:
+            delta = value - mean
+            mean += delta / (i + 1)
+            m2 += delta * (value - mean)
+        else:
+            old = close[i - period]
+            new_mean = mean + (value - old) / period
+            m2 += (value - old) * (value - new_mean + old - mean)
+            mean = new_mean
+
+        if same_run >= period:
+            mean = value
+            m2 = 0.0
+
+        if i >= period - 1:
+            middle[i] = mean
+            std[i] = np.sqrt(max(m2, 0.0) / (period - 1))
+
+    upper = middle + std * num_std
+    lower = middle - std * num_std
+    return middle, std, upper, lower
+
+
+@njit(cache=True, nogil=True)
+def rsi_sma(close, period):
+    """RSI from simple moving averages of gains and losses."""
+    n = close.shape[0]
+    out = np.full(n, np.nan)
+    gains = np.zeros(n)
+    losses = np.zeros(n)
+
+    for i in range(1, n):
+        delta = close[i] - close[i - 1]
+        if delta > 0:
+            gains[i] = delta
+        elif delta < 0:
+            losses[i] = -delta
+
+    gain_sum = 0.0
+    loss_sum = 0.0
+    # Count of non-zero entries in the window, so an all-flat window yields
+    # exact zeros instead of rounding residue from the running sums
+    gain_count = 0
+    loss_count = 0
+
+    for i in range(n):
+        gain_sum += gains[i]
+        loss_sum += losses[i]
+        gain_count += gains[i] > 0
+        loss_count += losses[i] > 0
+
+        if i >= period:
+            gain_sum -= gains[i - period]
+            loss_sum -= losses[i - period]
+            gain_count -= gains[i - period] > 0
+            loss_count -= losses[i - period] > 0
+
+        if gain_count == 0:
+            gain_sum = 0.0
+        if loss_count == 0:
+            loss_sum = 0.0
+
+        if i >= period - 1:
+            if loss_sum > 0:
+                out[i] = 100.0 - 100.0 / (1.0 + gain_sum / loss_sum)
+            elif gain_sum > 0:
+                out[i] = 100.0
+
+    return out
+
+
+@njit(cache=True, nogil=True)
+def rsi_wilder(close, period):
+    """
+    RSI with Wilder smoothing. The averages are seeded with the simple mean
+    of the first `period` gains and losses, then updated recursively with
+    avg = (avg * (period - 1) + value) / period.
+    """
+    n = close.shape[0]
+    out = np.full(n, np.nan)
+    if n <= period:
+        return out
+
+    avg_gain = 0.0
+    avg_loss = 0.0
+    for i in range(1, period + 1):
+        delta = close[i] - close[i - 1]
+        if delta > 0:
+            avg_gain += delta
+        else:
+            avg_loss -= delta
+    avg_gain /= period
+    avg_loss /= period
+
+    for i in range(period, n):
+        if i > period:
+            delta = close[i] - close[i - 1]
+            gain = delta if delta > 0 else 0.0
+            loss = -delta if delta < 0 else 0.0
+            avg_gain = (avg_gain * (period - 1) + gain) / period
+            avg_loss = (avg_loss * (period - 1) + loss) / period
+
+        if avg_loss > 0:
+            out[i] = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+        elif avg_gain > 0:
+            out[i] = 100.0
+
+    return out
+
+
+@njit(cache=True, nogil=True)
+def window_minmax(x, window):
+    """
+    Rolling minimum and maximum using monotonic index deques, O(n) overall.
+    Returns: (minimum, maximum); NaN for incomplete windows or windows
+    containing NaN.
+    """
+    n = x.shape[0]
+    lowest = np.full(n, np.nan)
+    highest = np.full(n, np.nan)
+    # Deques of indices stored in flat arrays; [head, tail) is live
+    lo_idx = np.empty(n, np.int64)
+    hi_idx = np.empty(n, np.int64)
+    lo_head = lo_tail = 0
+    hi_head = hi_tail = 0
+    last_nan = -1
+
+    for i in range(n):
+        value = x[i]
+        if np.isnan(value):
+            last_nan = i
+        else:
+            while lo_tail > lo_head and x[lo_idx[lo_tail - 1]] >= value:
+                lo_tail -= 1
+            lo_idx[lo_tail] = i
+            lo_tail += 1
+
+            while hi_tail > hi_head and x[hi_idx[hi_tail - 1]] <= value:
+                hi_tail -= 1
+            hi_idx[hi_tail] = i
+            hi_tail += 1
+
+        start = i - window + 1
+        while lo_tail > lo_head and lo_idx[lo_head] < start:
+            lo_head += 1
+        while hi_tail > hi_head and hi_idx[hi_head] < start:
+            hi_head += 1
+
+        if start >= 0 and last_nan < start:
+            lowest[i] = x[lo_idx[lo_head]]
+            highest[i] = x[hi_idx[hi_head]]
+
+    return lowest, highest
+
+
+@njit(cache=True, nogil=True)
+def ema_nb(x, span):
+    """
+    EMA with pandas ewm(span, adjust=False) semantics, including NaN input:
+    output is NaN until the first observation, gaps carry the last value,
+    and the weight of the previous average keeps decaying across a gap.
+    Use make_ema for NaN-free input.
+    """
+    n = x.shape[0]
+    out = np.empty(n)
+    alpha = 2.0 / (span + 1)
+    decay = 1.0 - alpha
+    value = np.nan
+    old_weight = 1.0
+
+    for i in range(n):
+        current = x[i]
+        if not np.isnan(value):
+            old_weight *= decay
+            if not np.isnan(current):
+                if value != current:
+                    value = (old_weight * value + alpha * current) / (old_weight + alpha)
+                old_weight = 1.0
+        elif not np.isnan(current):
+            value = current
+        out[i] = value
+
+    return out
+
+
+@lru_cache(maxsize=128)
+def make_ema(span):
+    """
+    Build an EMA kernel (pandas ewm(span, adjust=False)) for one span.
+    The smoothing factor is a compile-time constant of the returned kernel,
+    and kernels are shared by every caller using the same span.
+    """
+    alpha = 2.0 / (span + 1)
+    decay = 1.0 - alpha
+
+    @njit(cache=True, nogil=True)
+    def ema(x):
+        n = x.shape[0]
+        out = np.empty(n)
+        if n == 0:
+            return out
+
+        value = x[0]
+        out[0] = value
+        for i in range(1, n):
+            value = alpha * x[i] + decay * value
+            out[i] = value
+
+        return out
+
+    return ema
+
+
+@njit(cache=True, nogil=True)
+def macd_bundle(x, fast, slow, signal):
+    """
+    MACD line, signal line and histogram in a single pass over NaN-free
+    input, matching three chained ewm(span, adjust=False) calls.
+    """
+    n = x.shape[0]
+    macd_line = np.empty(n)
+    signal_line = np.empty(n)
+    histogram = np.empty(n)
+    if n == 0:
+        return macd_line, signal_line, histogram
+
+    fast_alpha = 2.0 / (fast + 1)
+    slow_alpha = 2.0 / (slow + 1)
+    signal_alpha = 2.0 / (signal + 1)
+    # Both EMAs start at the first price, so MACD and signal start at zero
+    ema_fast = x[0]
+    ema_slow = x[0]
+    sig = 0.0
+    macd_line[0] = 0.0
+    signal_line[0] = 0.0
+    histogram[0] = 0.0
+
+    for i in range(1, n):
+        price = x[i]
+        ema_fast = fast_alpha * price + (1.0 - fast_alpha) * ema_fast
+        ema_slow = slow_alpha * price + (1.0 - slow_alpha) * ema_slow
+        macd = ema_fast - ema_slow
+        sig = signal_alpha * macd + (1.0 - signal_alpha) * sig
+        macd_line[i] = macd
+        signal_line[i] = sig
+        histogram[i] = macd - sig
+
+    return macd_line, signal_line, histogram
+
+
+def move_mean(x: np.ndarray, window: int) -> np.ndarray:
+    """Rolling mean via bottleneck when installed, else the Numba kernel."""
+    if bn is not None:
+        if x.shape[0] < window:
+            return np.full(x.shape[0], np.nan)
+        return bn.move_mean(x, window)
+    return rolling_mean(x, window)
+
+
+def move_min(x: np.ndarray, window: int) -> np.ndarray:
+    """Rolling minimum via bottleneck when installed, else the Numba kernel."""
+    if bn is not None:
+        if x.shape[0] < window:
+            return np.full(x.shape[0], np.nan)
+        return bn.move_min(x, window)
+    return window_minmax(x, window)[0]
+
+
+def move_max(x: np.ndarray, window: int) -> np.ndarray:
+    """Rolling maximum via bottleneck when installed, else the Numba kernel."""
+    if bn is not None:
+        if x.shape[0] < window:
+            return np.full(x.shape[0], np.nan)
+        return bn.move_max(x, window)
+    return window_minmax(x, window)[1]
+
+
+@lru_cache(maxsize=32)
+def make_trend_update(fast_period, slow_period, rsi_period, volume_period):
+    """
+    Build a one-bar update kernel for the trend following indicators.
+    The periods are compile-time constants of the returned kernel, and
+    kernels are shared by every strategy using the same periods.
+
+    The kernel updates, in place:
+        state: float64 [count, fast_sum, slow_sum, volume_sum, avg_gain,
+               avg_loss, prev_close]
+        closes: ring buffer of the last max(fast_period, slow_period) closes
+        volumes: ring buffer of the last volume_period volumes
+    and returns (fast_ma, slow_ma, volume_ma, rsi) for the new bar, NaN
+    where not yet defined.
+    """
+    window = max(fast_period, slow_period)
+
+    @njit(cache=True, nogil=True)
+    def update(state, closes, volumes, close, volume):
+        count = int(state[0])
+
+        # Wilder averages, seeded with the mean of the first rsi_period diffs
+        if count > 0:
+            delta = close - state[6]
+            gain = delta if delta > 0 else 0.0
+            loss = -delta if delta < 0 else 0.0
+            if count <= rsi_period:
+                state[4] += gain
+                state[5] += loss
+                if count == rsi_period:
+                    state[4] /= rsi_period
+                    state[5] /= rsi_period
+            else:
+                state[4] = (state[4] * (rsi_period - 1) + gain) / rsi_period
+                state[5] = (state[5] * (rsi_period - 1) + loss) / rsi_period
+
+        # Window sums; both moving averages share the close ring buffer
+        if count >= fast_period:
+            state[1] -= closes[(count - fast_period) % window]
+        if count >= slow_period:
+            state[2] -= closes[(count - slow_period) % window]
+        closes[count % window] = close
+        state[1] += close
+        state[2] += close
+        if count >= volume_period:
+            state[3] -= volumes[count % volume_period]
+        volumes[count % volume_period] = volume
+        state[3] += volume
+
+        count += 1
+        state[0] = count
+        state[6] = close
+
+        fast_ma = state[1] / fast_period if count >= fast_period else np.nan
+        slow_ma = state[2] / slow_period if count >= slow_period else np.nan
+        volume_ma = state[3] / volume_period if count >= volume_period else np.nan
+        rsi = np.nan
+        if count > rsi_period:
+            if state[5] > 0:
+                rsi = 100.0 - 100.0 / (1.0 + state[4] / state[5])
+            elif state[4] > 0:
+                rsi = 100.0
+
+        return fast_ma, slow_ma, volume_ma, rsi
+
+    return update
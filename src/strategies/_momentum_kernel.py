@@ -0,0 +1,159 @@
+"""
+Fused indicator kernel for the momentum strategy.
+Computes every momentum indicator in a single pass over close and volume,
+matching the pandas definitions previously used by MomentumStrategy.
+"""
+
+import numpy as np
+
+from ._jit import njit
+
+# Column order of the matrix returned by compute()
+COLUMNS = (
+    'roc',
+    'momentum',
+    'momentum_norm',
+    'rsi',
+    'momentum_ma',
+    'momentum_accel',
+    'volume_ma',
+    'volume_momentum',
+    'macd',
+    'macd_signal',
+    'macd_hist',
+)
+
+MOMENTUM_MA_WINDOW = 5
+VOLUME_MA_WINDOW = 20
+MACD_FAST = 12
+MACD_SLOW = 26
+MACD_SIGNAL = 9
+
+
+@njit(cache=True, nogil=True, error_model='numpy')
+def compute(close, volume, roc_period, momentum_period, rsi_period):
+    """
+    Calculate all momentum indicators in one loop.
+
+    Args:
+        close: Close prices (float32 or float64)
+        volume: Volumes, same dtype as close
+        roc_period: Rate of Change period
+        momentum_period: Momentum period
+        rsi_period: RSI period
+
+    Returns:
+        (n, len(COLUMNS)) matrix in the input dtype, NaN where an indicator
+        is undefined. Running sums and EMA state are always kept in float64.
+    """
+    n = close.shape[0]
+    out = np.empty((n, len(COLUMNS)), dtype=close.dtype)
+    out[:] = np.nan
+
+    # RSI: running sums of gains/losses over rsi_period deltas
+    gains = np.zeros(n)
+    losses = np.zeros(n)
+    gain_sum = 0.0
+    loss_sum = 0.0
+    gain_count = 0
+    loss_count = 0
+
+    # Momentum MA: ring buffer of the last normalized momentum values
+    mom_ring = np.full(MOMENTUM_MA_WINDOW, np.nan)
+    mom_sum = 0.0
+    mom_nans = MOMENTUM_MA_WINDOW
+
+    vol_sum = 0.0
+
+    fast_alpha = 2.0 / (MACD_FAST + 1)
+    slow_alpha = 2.0 / (MACD_SLOW + 1)
+    signal_alpha = 2.0 / (MACD_SIGNAL + 1)
+    ema_fast = 0.0
+    ema_slow = 0.0
+    macd_signal = 0.0
+
+    prev_mom_norm = np.nan
+
+    for i in range(n):
+        price = float(close[i])
+
+        # Rate of change and momentum
+        if i >= roc_period:
+            out[i, 0] = price / close[i - roc_period] - 1.0
+        mom_norm = np.nan
+        if i >= momentum_period:
+            momentum = price - close[i - momentum_period]
+            mom_norm = momentum / price
+            out[i, 1] = momentum
+            out[i, 2] = mom_norm
+
+        # RSI
+        if i > 0:
+            delta = price - close[i - 1]
+            if delta > 0:
+                gains[i] = delta
+            elif delta < 0:
+                losses[i] = -delta
+        gain_sum += gains[i]
+        loss_sum += losses[i]
+        gain_count += gains[i] > 0
+        loss_count += losses[i] > 0
+        if i >= rsi_period:
+            gain_sum -= gains[i - rsi_period]
+            loss_sum -= losses[i - rsi_period]
+            gain_count -= gains[i - rsi_period] > 0
+            loss_count -= losses[i - rsi_period] > 0
+        # An all-flat window yields exact zeros, not running-sum residue
+        if gain_count == 0:
+            gain_sum = 0.0
+        if loss_count == 0:
+            loss_sum = 0.0
+        if i >= rsi_period - 1:
+            if loss_sum > 0:
+                out[i, 3] = 100.0 - 100.0 / (1.0 + gain_sum / loss_sum)
+            elif gain_sum > 0:
+                out[i, 3] = 100.0
+
+        # Momentum moving average and acceleration
+        slot = i % MOMENTUM_MA_WINDOW
+        old = mom_ring[slot]
+        if np.isnan(old):
+            mom_nans -= 1
+        else:
+            mom_sum -= old
+        if np.isnan(mom_norm):
+            mom_nans += 1
+        else:
+            mom_sum += mom_norm
+        mom_ring[slot] = mom_norm
+        if mom_nans == 0:
+            out[i, 4] = mom_sum / MOMENTUM_MA_WINDOW
+        out[i, 5] = mom_norm - prev_mom_norm
+        prev_mom_norm = mom_norm
+
+        # Volume moving average and volume momentum
+        vol_sum += volume[i]
+        if i >= VOLUME_MA_WINDOW:
+            vol_sum -= volume[i - VOLUME_MA_WINDOW]
+        if i >= VOLUME_MA_WINDOW - 1:
+            volume_ma = vol_sum / VOLUME_MA_WINDOW
+            out[i, 6] = volume_ma
+            out[i, 7] = (volume[i] - volume_ma) / volume_ma
+
+        # MACD from recursive EMAs seeded with the first price
+        if i == 0:
+            ema_fast = price
+            ema_slow = price
+        else:
+            ema_fast = fast_alpha * price + (1.0 - fast_alpha) * ema_fast
+            ema_slow = slow_alpha * price + (1.0 - slow_alpha) * ema_slow
+        macd = ema_fast - ema_slow
+        if i == 0:
+            macd_signal = macd
+        else:
+            macd_signal = signal_alpha * macd + (1.0 - signal_alpha) * macd_signal
+        out[i, 8] = macd
+        out[i, 9] = macd_signal
+        out[i, 10] = macd - macd_signal
+
+    return out
@@ -19,7 +19,7 @@ class SignalType(Enum):
     CLOSE_SHORT = "close_short"
 
 
-@dataclass
+@dataclass(slots=True)
 class StrategySignal:
     """
     Represents a trading signal generated by a strategy.
@@ -60,6 +60,9 @@ class BaseStrategy(ABC):
     Abstract base class for all trading strategies.
     """
 
+    # Subclasses that declare their own __slots__ get dict-free instances
+    __slots__ = ('name', 'config', 'signals_generated', 'last_signal_time')
+
     def __init__(self, name: str, config: Optional[Dict[str, Any]] = None):
         """
         Initialize the strategy.
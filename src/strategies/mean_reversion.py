@@ -7,6 +7,7 @@ import pandas as pd
 import numpy as np
 
 from .base_strategy import BaseStrategy, StrategySignal, SignalType
+from ._kernels import bbands_bundle, rolling_mean, rsi_sma
 
 
 class MeanReversionStrategy(BaseStrategy):
@@ -44,6 +45,12 @@ class MeanReversionStrategy(BaseStrategy):
         self.stop_loss_pct = self.config.get('stop_loss_pct', 0.03)
         self.take_profit_pct = self.config.get('take_profit_pct', 0.05)
 
+        # Fixed confidence thresholds, resolved once instead of per signal
+        self._vol_mult = 1.5
+        self._rsi_extreme_buy = 25.0
+        self._rsi_extreme_sell = 75.0
+        self._bb_width_quantile = 0.3
+
     def calculate_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
         """Calculate technical indicators."""
         df = df.copy()
@@ -71,6 +78,41 @@ class MeanReversionStrategy(BaseStrategy):
 
         return df
 
+    def compute_indicators_batch(
+        self, close: np.ndarray, volume: np.ndarray
+    ) -> Dict[str, np.ndarray]:
+        """
+        Calculate all indicators over a full price history in one pass.
+
+        Intended for backtests: call once before the bar loop and index the
+        returned arrays per bar instead of re-running calculate_indicators
+        on a growing slice.
+
+        Args:
+            close: Close prices
+            volume: Volumes
+
+        Returns:
+            Dictionary of indicator name -> array aligned with the input
+        """
+        close = np.ascontiguousarray(close, dtype=np.float64)
+        volume = np.ascontiguousarray(volume, dtype=np.float64)
+
+        bb_middle, bb_std, bb_upper, bb_lower = bbands_bundle(
+            close, self.bb_period, float(self.bb_std)
+        )
+
+        return {
+            'bb_middle': bb_middle,
+            'bb_upper': bb_upper,
+            'bb_lower': bb_lower,
+            'bb_width': (bb_upper - bb_lower) / bb_middle,
+            'bb_position': (close - bb_lower) / (bb_upper - bb_lower),
+            'rsi': rsi_sma(close, self.rsi_period),
+            'zscore': (close - bb_middle) / bb_std,
+            'volume_ma': rolling_mean(volume, 20),
+        }
+
     def _calculate_rsi(self, prices: pd.Series, period: int) -> pd.Series:
         """Calculate RSI indicator."""
         delta = prices.diff()
@@ -127,12 +169,7 @@ class MeanReversionStrategy(BaseStrategy):
                     quantity=0,
                     stop_loss=stop_loss,
                     take_profit=take_profit,
-                    metadata={
-                        'bb_position': current['bb_position'],
-                        'rsi': current['rsi'],
-                        'zscore': current['zscore'],
-                        'bb_width': current['bb_width']
-                    }
+                    metadata=self._signal_metadata(current)
                 )
 
         # Sell signal (overbought, near upper band)
@@ -146,17 +183,22 @@ class MeanReversionStrategy(BaseStrategy):
                     confidence=confidence,
                     entry_price=current_price,
                     quantity=0,
-                    metadata={
-                        'bb_position': current['bb_position'],
-                        'rsi': current['rsi'],
-                        'zscore': current['zscore'],
-                        'bb_width': current['bb_width']
-                    }
+                    metadata=self._signal_metadata(current)
                 )
 
-        self._record_signal(signal)
+        if signal is not None:
+            self._record_signal(signal)
         return signal
 
+    def _signal_metadata(self, current: pd.Series) -> Dict[str, Any]:
+        """Build signal metadata; only called once a signal is accepted."""
+        return {
+            'bb_position': current['bb_position'],
+            'rsi': current['rsi'],
+            'zscore': current['zscore'],
+            'bb_width': current['bb_width']
+        }
+
     def _is_oversold(self, current: pd.Series, previous: pd.Series) -> bool:
         """Check if price is in oversold condition."""
         # Price near or below lower Bollinger Band
@@ -185,55 +227,53 @@ class MeanReversionStrategy(BaseStrategy):
 
     def _calculate_buy_confidence(self, current: pd.Series, df: pd.DataFrame) -> float:
         """Calculate confidence for buy signal."""
+        rsi = current['rsi']
+        zscore = current['zscore']
+        rsi_extreme = self._rsi_extreme_buy
+
+        # Each condition contributes its weight when true; comparisons act
+        # as 0/1 so the score needs no data-dependent branches
         confidence = 0.4
 
         # Strong oversold condition
-        if current['rsi'] < 25:
-            confidence += 0.25
-        elif current['rsi'] < self.rsi_oversold:
-            confidence += 0.15
+        confidence += 0.25 * (rsi < rsi_extreme)
+        confidence += 0.15 * ((rsi >= rsi_extreme) & (rsi < self.rsi_oversold))
 
         # Price well below mean (z-score)
-        if current['zscore'] < -2:
-            confidence += 0.2
-        elif current['zscore'] < -1:
-            confidence += 0.1
+        confidence += 0.2 * (zscore < -2)
+        confidence += 0.1 * ((zscore >= -2) & (zscore < -1))
 
         # High volume (conviction)
-        if current['volume'] > current['volume_ma'] * 1.5:
-            confidence += 0.15
+        confidence += 0.15 * (current['volume'] > current['volume_ma'] * self._vol_mult)
 
         # Low volatility (better for mean reversion)
-        if current['bb_width'] < df['bb_width'].quantile(0.3):
-            confidence += 0.1
+        confidence += 0.1 * (current['bb_width'] < df['bb_width'].quantile(self._bb_width_quantile))
 
-        return min(confidence, 1.0)
+        return min(float(confidence), 1.0)
 
     def _calculate_sell_confidence(self, current: pd.Series, df: pd.DataFrame) -> float:
         """Calculate confidence for sell signal."""
+        rsi = current['rsi']
+        zscore = current['zscore']
+        rsi_extreme = self._rsi_extreme_sell
+
         confidence = 0.4
 
         # Strong overbought condition
-        if current['rsi'] > 75:
-            confidence += 0.25
-        elif current['rsi'] > self.rsi_overbought:
-            confidence += 0.15
+        confidence += 0.25 * (rsi > rsi_extreme)
+        confidence += 0.15 * ((rsi <= rsi_extreme) & (rsi > self.rsi_overbought))
 
         # Price well above mean (z-score)
-        if current['zscore'] > 2:
-            confidence += 0.2
-        elif current['zscore'] > 1:
-            confidence += 0.1
+        confidence += 0.2 * (zscore > 2)
+        confidence += 0.1 * ((zscore <= 2) & (zscore > 1))
 
         # High volume
-        if current['volume'] > current['volume_ma'] * 1.5:
-            confidence += 0.15
+        confidence += 0.15 * (current['volume'] > current['volume_ma'] * self._vol_mult)
 
         # Low volatility
-        if current['bb_width'] < df['bb_width'].quantile(0.3):
-            confidence += 0.1
+        confidence += 0.1 * (current['bb_width'] < df['bb_width'].quantile(self._bb_width_quantile))
 
-        return min(confidence, 1.0)
+        return min(float(confidence), 1.0)
 
     def validate_signal(self, signal: StrategySignal) -> bool:
         """Validate the generated signal."""
@@ -2,11 +2,32 @@
 Momentum strategy implementation.
 """
 
-from typing import Dict, Any, Optional
+from dataclasses import dataclass
+from math import isnan
+from typing import Dict, Any, Optional, Tuple
 import pandas as pd
 import numpy as np
 
 from .base_strategy import BaseStrategy, StrategySignal, SignalType
+from ._momentum_kernel import COLUMNS as MOMENTUM_COLUMNS, compute as compute_momentum
+
+
+@dataclass(slots=True)
+class IndicatorSnapshot:
+    """Indicator values for a single bar, as plain floats."""
+    momentum_norm: float
+    momentum_accel: float
+    rsi: float
+    macd_hist: float
+    volume_momentum: float
+    roc: float
+    close: float
+
+
+_SNAPSHOT_INDEX = [
+    MOMENTUM_COLUMNS.index(name)
+    for name in ('momentum_norm', 'momentum_accel', 'rsi', 'macd_hist', 'volume_momentum', 'roc')
+]
 
 
 class MomentumStrategy(BaseStrategy):
@@ -31,6 +52,8 @@ class MomentumStrategy(BaseStrategy):
             min_confidence: Minimum confidence threshold (default: 0.65)
             stop_loss_pct: Stop loss percentage (default: 0.025)
             take_profit_pct: Take profit percentage (default: 0.06)
+            float32_indicators: Run the indicator kernel on float32 arrays
+                (default: False)
         """
         super().__init__("Momentum", config)
 
@@ -41,51 +64,45 @@ class MomentumStrategy(BaseStrategy):
         self.min_confidence = self.config.get('min_confidence', 0.65)
         self.stop_loss_pct = self.config.get('stop_loss_pct', 0.025)
         self.take_profit_pct = self.config.get('take_profit_pct', 0.06)
+        self.float32_indicators = self.config.get('float32_indicators', False)
 
     def calculate_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
         """Calculate momentum indicators."""
-        df = df.copy()
-
-        # Rate of Change (ROC)
-        df['roc'] = df['close'].pct_change(periods=self.roc_period)
-
-        # Momentum (absolute price change)
-        df['momentum'] = df['close'] - df['close'].shift(self.momentum_period)
-
-        # Normalized momentum
-        df['momentum_norm'] = df['momentum'] / df['close']
-
-        # RSI
-        df['rsi'] = self._calculate_rsi(df['close'], self.rsi_period)
-
-        # Moving average of momentum
-        df['momentum_ma'] = df['momentum_norm'].rolling(window=5).mean()
-
-        # Momentum acceleration (change in momentum)
-        df['momentum_accel'] = df['momentum_norm'].diff()
-
-        # Volume momentum
-        df['volume_ma'] = df['volume'].rolling(window=20).mean()
-        df['volume_momentum'] = (df['volume'] - df['volume_ma']) / df['volume_ma']
+        _, values = self._compute_indicators(df)
+        return df.assign(**self._indicator_columns(values))
 
-        # MACD-like momentum indicator
-        ema_fast = df['close'].ewm(span=12, adjust=False).mean()
-        ema_slow = df['close'].ewm(span=26, adjust=False).mean()
-        df['macd'] = ema_fast - ema_slow
-        df['macd_signal'] = df['macd'].ewm(span=9, adjust=False).mean()
-        df['macd_hist'] = df['macd'] - df['macd_signal']
-
-        return df
-
-    def _calculate_rsi(self, prices: pd.Series, period: int) -> pd.Series:
-        """Calculate RSI indicator."""
-        delta = prices.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
+    def _compute_indicators(self, df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Run the indicator kernel on the close/volume arrays.
 
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
+        Returns:
+            (close array, (n, len(MOMENTUM_COLUMNS)) indicator matrix)
+        """
+        # float32 halves the memory traffic; the kernel keeps its running
+        # sums in float64 either way
+        dtype = np.float32 if self.float32_indicators else np.float64
+        close = df['close'].to_numpy(dtype=dtype)
+        values = compute_momentum(
+            close,
+            df['volume'].to_numpy(dtype=dtype),
+            self.roc_period,
+            self.momentum_period,
+            self.rsi_period,
+        )
+
+        return close, values
+
+    @staticmethod
+    def _indicator_columns(values: np.ndarray) -> Dict[str, np.ndarray]:
+        """Split the indicator matrix into column name -> array."""
+        return {column: values[:, i] for i, column in enumerate(MOMENTUM_COLUMNS)}
+
+    @staticmethod
+    def _snapshot(close: np.ndarray, values: np.ndarray, row: int) -> IndicatorSnapshot:
+        """Indicator values of one bar as plain floats."""
+        return IndicatorSnapshot(
+            *values[row, _SNAPSHOT_INDEX].tolist(), close=float(close[row])
+        )
 
     def generate_signal(
         self,
@@ -99,24 +116,22 @@ class MomentumStrategy(BaseStrategy):
         if historical_data is None or len(historical_data) < self.momentum_period + 1:
             return None
 
-        # Calculate indicators
-        df = self.calculate_indicators(historical_data)
-
-        # Get recent data
-        current = df.iloc[-1]
-        previous = df.iloc[-2]
+        # Calculate indicators; the length check above guarantees two bars
+        close, values = self._compute_indicators(historical_data)
+        current = self._snapshot(close, values, -1)
+        previous = self._snapshot(close, values, -2)
 
         # Check for NaN values
-        if pd.isna(current['momentum_norm']) or pd.isna(current['roc']):
+        if isnan(current.momentum_norm) or isnan(current.roc):
             return None
 
-        current_price = market_data.get('price', current['close'])
+        current_price = market_data.get('price', current.close)
 
         signal = None
 
         # Buy signal (strong positive momentum)
         if self._has_buy_momentum(current, previous):
-            confidence = self._calculate_buy_confidence(current, df)
+            confidence = self._calculate_buy_confidence(current, previous)
 
             if confidence >= self.min_confidence:
                 stop_loss = current_price * (1 - self.stop_loss_pct)
@@ -130,18 +145,12 @@ class MomentumStrategy(BaseStrategy):
                     quantity=0,
                     stop_loss=stop_loss,
                     take_profit=take_profit,
-                    metadata={
-                        'momentum': current['momentum_norm'],
-                        'roc': current['roc'],
-                        'rsi': current['rsi'],
-                        'momentum_accel': current['momentum_accel'],
-                        'macd_hist': current['macd_hist']
-                    }
+                    metadata=self._signal_metadata(current)
                 )
 
         # Sell signal (momentum weakening or reversing)
         elif self._has_sell_momentum(current, previous):
-            confidence = self._calculate_sell_confidence(current, df)
+            confidence = self._calculate_sell_confidence(current, previous)
 
             if confidence >= self.min_confidence:
                 signal = StrategySignal(
@@ -150,103 +159,176 @@ class MomentumStrategy(BaseStrategy):
                     confidence=confidence,
                     entry_price=current_price,
                     quantity=0,
-                    metadata={
-                        'momentum': current['momentum_norm'],
-                        'roc': current['roc'],
-                        'rsi': current['rsi'],
-                        'momentum_accel': current['momentum_accel'],
-                        'macd_hist': current['macd_hist']
-                    }
+                    metadata=self._signal_metadata(current)
                 )
 
-        self._record_signal(signal)
+        if signal is not None:
+            self._record_signal(signal)
         return signal
 
-    def _has_buy_momentum(self, current: pd.Series, previous: pd.Series) -> bool:
+    def _signal_metadata(self, current: IndicatorSnapshot) -> Dict[str, Any]:
+        """Build signal metadata; only called once a signal is accepted."""
+        return {
+            'momentum': current.momentum_norm,
+            'roc': current.roc,
+            'rsi': current.rsi,
+            'momentum_accel': current.momentum_accel,
+            'macd_hist': current.macd_hist
+        }
+
+    def generate_signals_batch(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Evaluate the signal logic for every bar of a history in one sweep.
+
+        Indicators are calculated once over the whole frame and the buy/sell
+        conditions are applied as vectorized masks, giving the same result
+        as calling generate_signal on each growing prefix of the history.
+
+        Args:
+            df: OHLCV history with 'close' and 'volume' columns
+
+        Returns:
+            int8 array per bar: 1 = buy, -1 = close long, 0 = no signal
+        """
+        _, values = self._compute_indicators(df)
+        ind = self._indicator_columns(values)
+
+        mom = ind['momentum_norm']
+        accel = ind['momentum_accel']
+        rsi = ind['rsi']
+        hist = ind['macd_hist']
+        prev_rsi = np.roll(rsi, 1)
+        prev_hist = np.roll(hist, 1)
+
+        valid = ~(np.isnan(mom) | np.isnan(ind['roc']))
+        valid[:self.momentum_period] = False
+
+        with np.errstate(invalid='ignore'):
+            buy_votes = (
+                (mom > self.min_momentum).astype(np.int8)
+                + (accel > 0)
+                + (hist > 0)
+                + ((rsi > 50) & (rsi < 75))
+            )
+            sell_votes = (
+                (mom < 0.005).astype(np.int8)
+                + (accel < 0)
+                + (hist < 0)
+                + (rsi < prev_rsi)
+            )
+            buy = valid & (buy_votes >= 3)
+            sell = valid & ~buy & (sell_votes >= 3)
+
+            # Same additions, in the same order, as the scalar confidence code
+            buy_conf = np.full(mom.shape, 0.5)
+            buy_conf += 0.15 * (mom > self.min_momentum * 2)
+            buy_conf += 0.1 * ((mom <= self.min_momentum * 2) & (mom > self.min_momentum))
+            buy_conf += 0.1 * (accel > 0.01)
+            buy_conf += 0.1 * ((rsi > 55) & (rsi < 70))
+            buy_conf += 0.1 * (hist > prev_hist)
+            buy_conf += 0.05 * (ind['volume_momentum'] > 0.2)
+
+            sell_conf = np.full(mom.shape, 0.5)
+            sell_conf += 0.2 * (mom < 0)
+            sell_conf += 0.1 * ((mom >= 0) & (mom < self.min_momentum * 0.5))
+            sell_conf += 0.15 * (accel < -0.01)
+            sell_conf += 0.1 * (rsi - prev_rsi < -5)
+            sell_conf += 0.1 * (hist < prev_hist)
+
+        buy &= np.minimum(buy_conf, 1.0) >= self.min_confidence
+        sell &= np.minimum(sell_conf, 1.0) >= self.min_confidence
+
+        return np.where(buy, 1, np.where(sell, -1, 0)).astype(np.int8)
+
+    def _has_buy_momentum(self, current: IndicatorSnapshot, previous: IndicatorSnapshot) -> bool:
         """Check for strong buying momentum."""
         # Strong positive momentum
-        strong_momentum = current['momentum_norm'] > self.min_momentum
+        strong_momentum = current.momentum_norm > self.min_momentum
 
         # Momentum accelerating
-        accelerating = current['momentum_accel'] > 0
+        accelerating = current.momentum_accel > 0
 
         # MACD bullish
-        macd_bullish = current['macd_hist'] > 0
+        macd_bullish = current.macd_hist > 0
 
         # RSI showing strength but not overbought
-        rsi_ok = 50 < current['rsi'] < 75
+        rsi_ok = 50 < current.rsi < 75
 
         # At least 3 of 4 conditions must be true
         conditions = [strong_momentum, accelerating, macd_bullish, rsi_ok]
         return sum(conditions) >= 3
 
-    def _has_sell_momentum(self, current: pd.Series, previous: pd.Series) -> bool:
+    def _has_sell_momentum(self, current: IndicatorSnapshot, previous: IndicatorSnapshot) -> bool:
         """Check for momentum reversal or weakness."""
         # Momentum turning negative or very weak
-        weak_momentum = current['momentum_norm'] < 0.005
+        weak_momentum = current.momentum_norm < 0.005
 
         # Momentum decelerating
-        decelerating = current['momentum_accel'] < 0
+        decelerating = current.momentum_accel < 0
 
         # MACD bearish
-        macd_bearish = current['macd_hist'] < 0
+        macd_bearish = current.macd_hist < 0
 
         # RSI showing weakness
-        rsi_weak = current['rsi'] < previous['rsi']
+        rsi_weak = current.rsi < previous.rsi
 
         # At least 3 of 4 conditions must be true
         conditions = [weak_momentum, decelerating, macd_bearish, rsi_weak]
         return sum(conditions) >= 3
 
-    def _calculate_buy_confidence(self, current: pd.Series, df: pd.DataFrame) -> float:
+    def _calculate_buy_confidence(
+        self, current: IndicatorSnapshot, previous: IndicatorSnapshot
+    ) -> float:
         """Calculate confidence for buy signal."""
         confidence = 0.5
 
         # Very strong momentum
-        if current['momentum_norm'] > self.min_momentum * 2:
+        if current.momentum_norm > self.min_momentum * 2:
             confidence += 0.15
-        elif current['momentum_norm'] > self.min_momentum:
+        elif current.momentum_norm > self.min_momentum:
             confidence += 0.1
 
         # Strong acceleration
-        if current['momentum_accel'] > 0.01:
+        if current.momentum_accel > 0.01:
             confidence += 0.1
 
         # RSI in sweet spot (50-70)
-        if 55 < current['rsi'] < 70:
+        if 55 < current.rsi < 70:
             confidence += 0.1
 
         # MACD histogram increasing
-        if current['macd_hist'] > df['macd_hist'].iloc[-2]:
+        if current.macd_hist > previous.macd_hist:
             confidence += 0.1
 
         # Strong volume
-        if current['volume_momentum'] > 0.2:
+        if current.volume_momentum > 0.2:
             confidence += 0.05
 
         return min(confidence, 1.0)
 
-    def _calculate_sell_confidence(self, current: pd.Series, df: pd.DataFrame) -> float:
+    def _calculate_sell_confidence(
+        self, current: IndicatorSnapshot, previous: IndicatorSnapshot
+    ) -> float:
         """Calculate confidence for sell signal."""
         confidence = 0.5
 
         # Momentum turned negative
-        if current['momentum_norm'] < 0:
+        if current.momentum_norm < 0:
             confidence += 0.2
-        elif current['momentum_norm'] < self.min_momentum * 0.5:
+        elif current.momentum_norm < self.min_momentum * 0.5:
             confidence += 0.1
 
         # Strong deceleration
-        if current['momentum_accel'] < -0.01:
+        if current.momentum_accel < -0.01:
             confidence += 0.15
 
         # RSI declining
-        rsi_decline = current['rsi'] - df['rsi'].iloc[-2]
+        rsi_decline = current.rsi - previous.rsi
         if rsi_decline < -5:
             confidence += 0.1
 
         # MACD histogram declining
-        if current['macd_hist'] < df['macd_hist'].iloc[-2]:
+        if current.macd_hist < previous.macd_hist:
             confidence += 0.1
 
         return min(confidence, 1.0)
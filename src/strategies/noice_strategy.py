@@ -3,9 +3,12 @@ NOICE Trading Strategy Implementation
 Advanced technical analysis strategy optimized for NOICE token trading.
 """
 
+import math
 import pandas as pd
 import numpy as np
-from typing import Optional, Tuple
+from collections import deque
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime
 
 from ..core.strategy_interface import (
@@ -16,6 +19,18 @@ from ..core.strategy_interface import (
     PositionSide,
 )
 from ..core.market_data import OHLCVData
+from ._kernels import (
+    ema_nb,
+    macd_bundle,
+    make_ema,
+    move_max,
+    move_mean,
+    move_min,
+)
+
+# Stochastic settings used by the strategy (TechnicalIndicators defaults)
+STOCH_K_PERIOD = 14
+STOCH_D_PERIOD = 3
 
 
 class TechnicalIndicators:
@@ -24,24 +39,39 @@ class TechnicalIndicators:
     @staticmethod
     def ema(data: pd.Series, period: int) -> pd.Series:
         """Calculate Exponential Moving Average."""
-        return data.ewm(span=period, adjust=False).mean()
+        x = data.to_numpy(dtype=np.float64)
+        if np.isnan(x).any():
+            # General kernel re-weights around gaps the way pandas does
+            return pd.Series(ema_nb(x, period), index=data.index)
+        return pd.Series(make_ema(period)(x), index=data.index)
 
     @staticmethod
     def sma(data: pd.Series, period: int) -> pd.Series:
         """Calculate Simple Moving Average."""
-        return data.rolling(window=period).mean()
+        values = move_mean(data.to_numpy(dtype=np.float64), period)
+        return pd.Series(values, index=data.index)
 
     @staticmethod
     def rsi(data: pd.Series, period: int = 14) -> pd.Series:
         """Calculate Relative Strength Index."""
-        delta = data.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
+        x = data.to_numpy(dtype=np.float64)
+        rsi = np.full(x.shape[0], 50.0)  # Neutral RSI where undefined
+        if x.shape[0] < period:
+            return pd.Series(rsi, index=data.index)
+
+        delta = np.zeros_like(x)
+        delta[1:] = np.diff(x)
+        moves = np.stack([np.where(delta > 0, delta, 0.0), np.where(delta < 0, -delta, 0.0)])
+
+        # Window sums of gains and losses in one contraction
+        gain, loss = np.einsum("kij->ki", sliding_window_view(moves, period, axis=1)) / period
 
         # Avoid division by zero
-        rs = gain / loss.replace(0, np.nan)
-        rsi = 100 - (100 / (1 + rs))
-        return rsi.fillna(50)  # Neutral RSI for NaN values
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rs = gain / np.where(loss == 0, np.nan, loss)
+            values = 100 - (100 / (1 + rs))
+        rsi[period - 1:] = np.where(np.isnan(values), 50.0, values)
+        return pd.Series(rsi, index=data.index)
 
     @staticmethod
     def macd(
@@ -51,10 +81,18 @@ class TechnicalIndicators:
         Calculate MACD indicator.
         Returns: (macd_line, signal_line, histogram)
         """
-        ema_fast = data.ewm(span=fast, adjust=False).mean()
-        ema_slow = data.ewm(span=slow, adjust=False).mean()
+        x = data.to_numpy(dtype=np.float64)
+        if not np.isnan(x).any():
+            macd_line, signal_line, histogram = macd_bundle(x, fast, slow, signal)
+            return (
+                pd.Series(macd_line, index=data.index),
+                pd.Series(signal_line, index=data.index),
+                pd.Series(histogram, index=data.index),
+            )
+        ema_fast = TechnicalIndicators.ema(data, fast)
+        ema_slow = TechnicalIndicators.ema(data, slow)
         macd_line = ema_fast - ema_slow
-        signal_line = macd_line.ewm(span=signal, adjust=False).mean()
+        signal_line = TechnicalIndicators.ema(macd_line, signal)
         histogram = macd_line - signal_line
         return macd_line, signal_line, histogram
 
@@ -66,8 +104,21 @@ class TechnicalIndicators:
         Calculate Bollinger Bands.
         Returns: (upper_band, middle_band, lower_band)
         """
-        middle = data.rolling(window=period).mean()
-        std = data.rolling(window=period).std()
+        x = data.to_numpy(dtype=np.float64)
+        middle_values = np.full(x.shape[0], np.nan)
+        std_values = np.full(x.shape[0], np.nan)
+
+        if x.shape[0] >= period:
+            windows = sliding_window_view(x, period)
+            mean = np.einsum("ij->i", windows) / period
+            # Centered second pass; E[x^2] - E[x]^2 cancels badly at price scale
+            deviations = windows - mean[:, None]
+            variance = np.einsum("ij,ij->i", deviations, deviations) / (period - 1)
+            middle_values[period - 1:] = mean
+            std_values[period - 1:] = np.sqrt(variance)
+
+        middle = pd.Series(middle_values, index=data.index)
+        std = pd.Series(std_values, index=data.index)
         upper = middle + (std * std_dev)
         lower = middle - (std * std_dev)
         return upper, middle, lower
@@ -77,13 +128,24 @@ class TechnicalIndicators:
         high: pd.Series, low: pd.Series, close: pd.Series, period: int = 14
     ) -> pd.Series:
         """Calculate Average True Range."""
-        tr1 = high - low
-        tr2 = abs(high - close.shift())
-        tr3 = abs(low - close.shift())
-
-        tr_data = pd.concat([tr1, tr2, tr3], axis=1)
-        tr = tr_data.max(axis=1)
-        atr = tr.rolling(window=period).mean()
+        h = high.to_numpy(dtype=np.float64)
+        l = low.to_numpy(dtype=np.float64)
+        c = close.to_numpy(dtype=np.float64)
+
+        prev_close = np.empty_like(c)
+        prev_close[:1] = np.nan
+        prev_close[1:] = c[:-1]
+
+        # In-place fabs/fmax keep this to three temporaries; fmax ignores the
+        # missing previous close on the first bar
+        tr = h - l
+        gap_up = np.subtract(h, prev_close)
+        np.fabs(gap_up, out=gap_up)
+        gap_down = np.subtract(l, prev_close, out=prev_close)
+        np.fabs(gap_down, out=gap_down)
+        np.fmax(gap_up, gap_down, out=gap_up)
+        np.fmax(tr, gap_up, out=tr)
+        atr = pd.Series(move_mean(tr, period), index=high.index)
         return atr
 
     @staticmethod
@@ -98,18 +160,306 @@ class TechnicalIndicators:
         Calculate Stochastic Oscillator.
         Returns: (%K, %D)
         """
-        lowest_low = low.rolling(window=k_period).min()
-        highest_high = high.rolling(window=k_period).max()
+        lowest_low = move_min(low.to_numpy(dtype=np.float64), k_period)
+        highest_high = move_max(high.to_numpy(dtype=np.float64), k_period)
+        lowest_low = pd.Series(lowest_low, index=low.index)
+        highest_high = pd.Series(highest_high, index=high.index)
 
         k_percent = 100 * ((close - lowest_low) / (highest_high - lowest_low))
-        d_percent = k_percent.rolling(window=d_period).mean()
+        d_percent = pd.Series(
+            move_mean(k_percent.to_numpy(dtype=np.float64), d_period),
+            index=k_percent.index,
+        )
 
         return k_percent, d_percent
 
     @staticmethod
     def volume_sma(volume: pd.Series, period: int = 20) -> pd.Series:
         """Calculate volume simple moving average."""
-        return volume.rolling(window=period).mean()
+        values = move_mean(volume.to_numpy(dtype=np.float64), period)
+        return pd.Series(values, index=volume.index)
+
+
+class NOICEStreamingIndicators:
+    """
+    Incremental indicator state for the NOICE strategy.
+
+    push() folds one bar into running EMAs, window sums and monotonic
+    min/max deques, so the per-bar cost does not depend on the length of
+    the history. snapshot() derives the indicator values from that state
+    and is only needed for bars that are actually evaluated. Values match
+    TechnicalIndicators computed over the same bars.
+    """
+
+    def __init__(self, parameters: "NOICEStrategyParameters"):
+        self.parameters = parameters
+
+        self._ema_fast_alpha = 2.0 / (parameters.ema_fast + 1)
+        self._ema_slow_alpha = 2.0 / (parameters.ema_slow + 1)
+        self._macd_fast_alpha = 2.0 / (parameters.macd_fast + 1)
+        self._macd_slow_alpha = 2.0 / (parameters.macd_slow + 1)
+        self._macd_signal_alpha = 2.0 / (parameters.macd_signal + 1)
+
+        self.reset()
+
+    def reset(self):
+        """Clear all running state."""
+        p = self.parameters
+
+        self.count = 0
+
+        # Latest bar, and the previous bar's values used for crossovers
+        self.timestamp = None
+        self.close = None
+        self.volume = 0.0
+        self.prev_close = None
+        self.macd = 0.0
+        self.prev_macd = math.nan
+        self.prev_macd_signal = math.nan
+
+        self.ema_fast = 0.0
+        self.ema_slow = 0.0
+        self.macd_fast_ema = 0.0
+        self.macd_slow_ema = 0.0
+        self.macd_signal_ema = 0.0
+
+        # RSI: window sums of gains/losses, plus non-zero counts so a flat
+        # window gives exact zeros rather than running-sum residue
+        self.rsi_gains = deque(maxlen=p.rsi_period)
+        self.rsi_losses = deque(maxlen=p.rsi_period)
+        self.rsi_gain_sum = 0.0
+        self.rsi_loss_sum = 0.0
+        self.rsi_gain_count = 0
+        self.rsi_loss_count = 0
+
+        # Bollinger Bands: sliding Welford mean/M2 (sample std)
+        self.bb_window = deque(maxlen=p.bb_period)
+        self.bb_mean = 0.0
+        self.bb_m2 = 0.0
+        self.bb_same_run = 0
+
+        self.atr_window = deque(maxlen=p.atr_period)
+        self.atr_sum = 0.0
+
+        self.vol_window = deque(maxlen=p.volume_period)
+        self.vol_sum = 0.0
+
+        # Stochastic: monotonic deques of (index, value)
+        self.stoch_low_deque = deque()
+        self.stoch_high_deque = deque()
+        self.stoch_k_window = deque(maxlen=STOCH_D_PERIOD)
+
+    @property
+    def volume_sma(self) -> float:
+        """Volume simple moving average, NaN until the window is full."""
+        period = self.parameters.volume_period
+        if len(self.vol_window) < period:
+            return math.nan
+        return self.vol_sum / period
+
+    def update(self, ohlcv: OHLCVData) -> Dict[str, Any]:
+        """
+        Fold one bar into the running state and return its values.
+
+        Args:
+            ohlcv: Next OHLCV bar
+
+        Returns:
+            Indicator values for this bar, keyed like the indicator columns
+        """
+        self.push(ohlcv)
+        return self.snapshot()
+
+    def push(self, ohlcv: OHLCVData):
+        """
+        Fold one bar into the running state.
+
+        Args:
+            ohlcv: Next OHLCV bar
+        """
+        p = self.parameters
+        i = self.count
+        close = ohlcv.close
+        high = ohlcv.high
+        low = ohlcv.low
+        volume = ohlcv.volume
+        prev_close = self.close
+
+        self.prev_macd = self.macd if i else math.nan
+        self.prev_macd_signal = self.macd_signal_ema if i else math.nan
+
+        # EMAs (adjust=False, seeded with the first close)
+        if i == 0:
+            self.ema_fast = self.ema_slow = close
+            self.macd_fast_ema = self.macd_slow_ema = close
+        else:
+            a = self._ema_fast_alpha
+            self.ema_fast = a * close + (1 - a) * self.ema_fast
+            a = self._ema_slow_alpha
+            self.ema_slow = a * close + (1 - a) * self.ema_slow
+            a = self._macd_fast_alpha
+            self.macd_fast_ema = a * close + (1 - a) * self.macd_fast_ema
+            a = self._macd_slow_alpha
+            self.macd_slow_ema = a * close + (1 - a) * self.macd_slow_ema
+
+        macd = self.macd_fast_ema - self.macd_slow_ema
+        if i == 0:
+            self.macd_signal_ema = macd
+        else:
+            a = self._macd_signal_alpha
+            self.macd_signal_ema = a * macd + (1 - a) * self.macd_signal_ema
+        self.macd = macd
+
+        # RSI
+        delta = 0.0 if prev_close is None else close - prev_close
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        if len(self.rsi_gains) == p.rsi_period:
+            old_gain = self.rsi_gains[0]
+            old_loss = self.rsi_losses[0]
+            self.rsi_gain_sum -= old_gain
+            self.rsi_loss_sum -= old_loss
+            self.rsi_gain_count -= old_gain > 0
+            self.rsi_loss_count -= old_loss > 0
+        self.rsi_gains.append(gain)
+        self.rsi_losses.append(loss)
+        self.rsi_gain_sum += gain
+        self.rsi_loss_sum += loss
+        self.rsi_gain_count += gain > 0
+        self.rsi_loss_count += loss > 0
+        if self.rsi_gain_count == 0:
+            self.rsi_gain_sum = 0.0
+        if self.rsi_loss_count == 0:
+            self.rsi_loss_sum = 0.0
+
+        # Bollinger Bands
+        period = p.bb_period
+        if prev_close is not None and close == prev_close:
+            self.bb_same_run += 1
+        else:
+            self.bb_same_run = 1
+        if len(self.bb_window) < period:
+            delta = close - self.bb_mean
+            self.bb_mean += delta / (len(self.bb_window) + 1)
+            self.bb_m2 += delta * (close - self.bb_mean)
+        else:
+            old = self.bb_window[0]
+            new_mean = self.bb_mean + (close - old) / period
+            self.bb_m2 += (close - old) * (close - new_mean + old - self.bb_mean)
+            self.bb_mean = new_mean
+        if self.bb_same_run >= period:
+            self.bb_mean = close
+            self.bb_m2 = 0.0
+        self.bb_window.append(close)
+
+        # ATR
+        tr = high - low
+        if prev_close is not None:
+            tr = max(tr, abs(high - prev_close), abs(low - prev_close))
+        if len(self.atr_window) == p.atr_period:
+            self.atr_sum -= self.atr_window[0]
+        self.atr_window.append(tr)
+        self.atr_sum += tr
+
+        # Volume SMA
+        if len(self.vol_window) == p.volume_period:
+            self.vol_sum -= self.vol_window[0]
+        self.vol_window.append(volume)
+        self.vol_sum += volume
+
+        # Stochastic (%K feeds the %D window, so it is kept per bar)
+        lows = self.stoch_low_deque
+        highs = self.stoch_high_deque
+        while lows and lows[-1][1] >= low:
+            lows.pop()
+        lows.append((i, low))
+        while highs and highs[-1][1] <= high:
+            highs.pop()
+        highs.append((i, high))
+        window_start = i - STOCH_K_PERIOD + 1
+        if lows[0][0] < window_start:
+            lows.popleft()
+        if highs[0][0] < window_start:
+            highs.popleft()
+
+        stoch_k = math.nan
+        if window_start >= 0:
+            lowest_low = lows[0][1]
+            price_range = highs[0][1] - lowest_low
+            offset = close - lowest_low
+            if price_range:
+                stoch_k = 100 * (offset / price_range)
+            elif offset:
+                stoch_k = math.copysign(math.inf, offset)
+        self.stoch_k_window.append(stoch_k)
+
+        self.count = i + 1
+        self.timestamp = ohlcv.timestamp
+        self.prev_close = prev_close
+        self.close = close
+        self.volume = volume
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Indicator values for the latest bar.
+
+        Returns:
+            Indicator values keyed like the indicator columns
+        """
+        p = self.parameters
+
+        rsi = 50.0  # Neutral RSI until defined, as TechnicalIndicators.rsi
+        if len(self.rsi_gains) == p.rsi_period and self.rsi_loss_sum > 0:
+            rs = self.rsi_gain_sum / self.rsi_loss_sum
+            rsi = 100 - (100 / (1 + rs))
+
+        period = p.bb_period
+        bb_upper = bb_middle = bb_lower = math.nan
+        if len(self.bb_window) == period:
+            bb_middle = self.bb_mean
+            bb_std = math.sqrt(max(self.bb_m2, 0.0) / (period - 1))
+            bb_upper = bb_middle + bb_std * p.bb_std
+            bb_lower = bb_middle - bb_std * p.bb_std
+
+        atr = math.nan
+        if len(self.atr_window) == p.atr_period:
+            atr = self.atr_sum / p.atr_period
+
+        stoch_d = math.nan
+        if len(self.stoch_k_window) == STOCH_D_PERIOD:
+            stoch_d = sum(self.stoch_k_window) / STOCH_D_PERIOD
+
+        return {
+            "timestamp": self.timestamp,
+            "close": self.close,
+            "volume": self.volume,
+            "ema_fast": self.ema_fast,
+            "ema_slow": self.ema_slow,
+            "rsi": rsi,
+            "macd": self.macd,
+            "macd_signal": self.macd_signal_ema,
+            "macd_hist": self.macd - self.macd_signal_ema,
+            "bb_upper": bb_upper,
+            "bb_middle": bb_middle,
+            "bb_lower": bb_lower,
+            "atr": atr,
+            "volume_sma": self.volume_sma,
+            "stoch_k": self.stoch_k_window[-1],
+            "stoch_d": stoch_d,
+        }
+
+    def previous_snapshot(self) -> Dict[str, Any]:
+        """
+        The previous bar's values that the scoring rules compare against.
+
+        Returns:
+            Close and MACD line/signal of the bar before the latest one
+        """
+        return {
+            "close": self.prev_close,
+            "macd": self.prev_macd,
+            "macd_signal": self.prev_macd_signal,
+        }
 
 
 class NOICEStrategyParameters(StrategyParameters):
@@ -160,10 +510,24 @@ class NOICEStrategy(BaseStrategy):
     - ATR for dynamic stop losses
     """
 
+    # Indicator values recorded in buy/sell signal metadata
+    _META_KEYS = ("ema_fast", "ema_slow", "rsi", "macd", "macd_signal", "atr")
+
     def __init__(self, symbol: str = "NOICEUSDT"):
         parameters = NOICEStrategyParameters()
         super().__init__(symbol, parameters)
         self.indicators = TechnicalIndicators()
+        self.state = NOICEStreamingIndicators(self.parameters)
+
+        # Stamp signals with the bar time; set for wall-clock timestamps
+        self._use_wall_clock = False
+
+        # Condition weights for the bullish/bearish scores: EMA trend, RSI
+        # (full/partial), MACD (crossover/above), Bollinger Bands
+        # (band/middle), stochastic (both/partial), price momentum
+        self._bull_weights = np.array([1.0, 1.0, 0.5, 1.5, 0.5, 1.0, 0.3, 1.0, 0.3, 0.5])
+        self._bear_weights = self._bull_weights.copy()
+        self._max_score = 6.0  # Total possible points
 
     def get_required_history(self) -> int:
         """Return minimum candles needed for calculations."""
@@ -178,68 +542,221 @@ class NOICEStrategy(BaseStrategy):
             + 10
         )  # Extra buffer
 
-    def _generate_signal(self) -> Optional[TradingSignal]:
-        """Generate NOICE trading signal based on multi-indicator analysis."""
-        try:
-            # Convert buffer to DataFrame
-            df = self._create_dataframe()
-
-            if len(df) < self.get_required_history():
-                return None
+    def add_data(self, ohlcv: OHLCVData):
+        """Add a bar to the buffer and fold it into the streaming indicators."""
+        super().add_data(ohlcv)
+        self.state.push(ohlcv)
 
-            # Calculate all indicators
-            self._calculate_indicators(df)
+    def update_batch(self, bars: List[OHLCVData]) -> List[Optional[TradingSignal]]:
+        """
+        Process several bars in order with the same rules as update().
 
-            # Get current and previous values
-            current = df.iloc[-1]
-            previous = df.iloc[-2]
+        The buffer is extended and trimmed once per batch, bars still inside
+        the warm-up window are only folded into the streaming indicators, and
+        the wall clock rate limit is re-read only after a signal is accepted.
 
-            # Check volume confirmation first
-            if not self._check_volume_confirmation(current):
-                return self._create_hold_signal(current, "Insufficient volume")
+        Args:
+            bars: OHLCV data points, oldest first
 
-            # Analyze for bullish signals
-            bullish_score = self._analyze_bullish_conditions(current, previous, df)
+        Returns:
+            One entry per bar: TradingSignal if conditions met, None otherwise
+        """
+        required = self.get_required_history()
+        available = len(self.data_buffer)
+
+        self.data_buffer.extend(bars)
+        max_buffer_size = max(500, required * 2)
+        if len(self.data_buffer) > max_buffer_size:
+            self.data_buffer = self.data_buffer[-max_buffer_size:]
+
+        signals: List[Optional[TradingSignal]] = []
+        rate_limited = self._is_rate_limited()
+        for ohlcv in bars:
+            self.state.push(ohlcv)
+            available += 1
+            if available < required or rate_limited:
+                signals.append(None)
+                continue
+
+            signal = self._accept_signal(self._generate_signal())
+            if signal is not None:
+                rate_limited = self._is_rate_limited()
+            signals.append(signal)
+
+        return signals
+
+    def reset(self):
+        """Reset strategy state, buffers and streaming indicators."""
+        super().reset()
+        self.state.reset()
 
-            # Analyze for bearish signals
-            bearish_score = self._analyze_bearish_conditions(current, previous, df)
+    def _generate_signal(self) -> Optional[TradingSignal]:
+        """Generate NOICE trading signal based on multi-indicator analysis."""
+        try:
+            state = self.state
+            if state.count < 2:
+                return None
 
-            # Generate signal based on scores
-            if bullish_score >= 0.75:
-                return self._create_buy_signal(current, bullish_score, df)
-            elif bearish_score >= 0.75 and self.parameters.enable_short_selling:
-                return self._create_sell_signal(current, bearish_score, df)
-            else:
+            # Volume gate first: it only needs the volume SMA, so the other
+            # indicator values are not derived for low-volume bars
+            if not self._check_volume_confirmation(state.volume, state.volume_sma):
                 return self._create_hold_signal(
-                    current,
-                    f"Bullish: {bullish_score:.2f}, Bearish: {bearish_score:.2f}",
+                    {"close": state.close, "timestamp": state.timestamp},
+                    "Insufficient volume",
                 )
 
+            # Evaluate current and previous indicator values
+            return self._evaluate_rows(state.snapshot(), state.previous_snapshot())
+
         except Exception as e:
             print(f"Error generating signal: {e}")
             return None
 
-    def _create_dataframe(self) -> pd.DataFrame:
-        """Convert OHLCV buffer to pandas DataFrame."""
-        data = []
-        for ohlcv in self.data_buffer:
-            data.append(
-                {
-                    "timestamp": ohlcv.timestamp,
-                    "open": ohlcv.open,
-                    "high": ohlcv.high,
-                    "low": ohlcv.low,
-                    "close": ohlcv.close,
-                    "volume": ohlcv.volume,
-                }
+    def generate_signals_batch(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Evaluate the signal logic for every bar of a history in one sweep.
+
+        Indicators are calculated once over the whole frame and the scoring
+        rules are applied as vectorized masks. Signal rate limiting is wall
+        clock based and is not applied here.
+
+        Args:
+            df: OHLCV history with open/high/low/close/volume columns
+
+        Returns:
+            int8 array per bar: 1 = buy, -1 = sell, 0 = no signal
+        """
+        df = df.copy()
+        p = self.parameters
+        signals = np.zeros(len(df), dtype=np.int8)
+
+        # Same warm-up as update(): a full history window and a previous bar
+        ready = np.zeros(len(df), dtype=bool)
+        ready[max(self.get_required_history() - 1, 1):] = True
+
+        # Volume gate first; skip the remaining indicators if no bar passes
+        self._calc_volume_sma(df)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            volume_ok = df["volume"].to_numpy() / df["volume_sma"].to_numpy() >= (
+                p.min_volume_multiplier
+            )
+        candidates = ready & volume_ok
+        if not candidates.any():
+            return signals
+
+        self._calc_rest(df)
+
+        close = df["close"].to_numpy()
+        prev_close = np.roll(close, 1)
+        ema_fast = df["ema_fast"].to_numpy()
+        ema_slow = df["ema_slow"].to_numpy()
+        rsi = df["rsi"].to_numpy()
+        macd = df["macd"].to_numpy()
+        macd_signal = df["macd_signal"].to_numpy()
+        prev_macd = np.roll(macd, 1)
+        prev_macd_signal = np.roll(macd_signal, 1)
+        bb_upper = df["bb_upper"].to_numpy()
+        bb_middle = df["bb_middle"].to_numpy()
+        bb_lower = df["bb_lower"].to_numpy()
+        stoch_k = df["stoch_k"].to_numpy()
+        stoch_d = df["stoch_d"].to_numpy()
+
+        with np.errstate(invalid="ignore"):
+            macd_above = macd > macd_signal
+            bull_cross = macd_above & (prev_macd <= prev_macd_signal)
+            at_lower_band = close <= bb_lower
+            stoch_low = (stoch_k < 20) & (stoch_d < 20)
+            rsi_oversold = rsi < p.rsi_oversold
+            bullish = np.column_stack(
+                [
+                    (close > ema_fast) & (ema_fast > ema_slow),
+                    rsi_oversold,
+                    ~rsi_oversold & (rsi < 45),
+                    bull_cross,
+                    ~bull_cross & macd_above,
+                    at_lower_band,
+                    ~at_lower_band & (close < bb_middle),
+                    stoch_low,
+                    ~stoch_low & (stoch_k < 50),
+                    close > prev_close,
+                ]
+            )
+
+            macd_below = macd < macd_signal
+            bear_cross = macd_below & (prev_macd >= prev_macd_signal)
+            at_upper_band = close >= bb_upper
+            stoch_high = (stoch_k > 80) & (stoch_d > 80)
+            rsi_overbought = rsi > p.rsi_overbought
+            bearish = np.column_stack(
+                [
+                    (close < ema_fast) & (ema_fast < ema_slow),
+                    rsi_overbought,
+                    ~rsi_overbought & (rsi > 55),
+                    bear_cross,
+                    ~bear_cross & macd_below,
+                    at_upper_band,
+                    ~at_upper_band & (close > bb_middle),
+                    stoch_high,
+                    ~stoch_high & (stoch_k > 50),
+                    close < prev_close,
+                ]
             )
 
-        df = pd.DataFrame(data)
-        df.set_index("timestamp", inplace=True)
-        return df
+        bullish_score = np.minimum(bullish @ self._bull_weights / self._max_score, 1.0)
+        bearish_score = np.minimum(bearish @ self._bear_weights / self._max_score, 1.0)
+
+        buy_setup = candidates & (bullish_score >= 0.75)
+        buy = buy_setup & (bullish_score >= p.min_confidence)
+        sell = (
+            candidates
+            & ~buy_setup
+            & (bearish_score >= 0.75)
+            & (bearish_score >= p.min_confidence)
+        )
+        if not p.enable_short_selling:
+            sell[:] = False
+
+        signals[buy] = 1
+        signals[sell] = -1
+        return signals
+
+    def _evaluate_rows(
+        self, current: Dict[str, Any], previous: Dict[str, Any]
+    ) -> TradingSignal:
+        """Score one bar's indicator values against the previous bar's."""
+        # Analyze for bullish signals
+        bullish_score = self._analyze_bullish_conditions(current, previous)
+
+        # Analyze for bearish signals
+        bearish_score = self._analyze_bearish_conditions(current, previous)
+
+        # Generate signal based on scores
+        if bullish_score >= 0.75:
+            return self._create_buy_signal(current, bullish_score)
+        elif bearish_score >= 0.75 and self.parameters.enable_short_selling:
+            return self._create_sell_signal(current, bearish_score)
+        else:
+            return self._create_hold_signal(
+                current,
+                f"Bullish: {bullish_score:.2f}, Bearish: {bearish_score:.2f}",
+            )
 
     def _calculate_indicators(self, df: pd.DataFrame):
-        """Calculate all technical indicators."""
+        """
+        Calculate all technical indicators over a full history DataFrame.
+        Live updates use the streaming state instead.
+        """
+        self._calc_volume_sma(df)
+        self._calc_rest(df)
+
+    def _calc_volume_sma(self, df: pd.DataFrame):
+        """Calculate the volume SMA used by the volume confirmation gate."""
+        df["volume_sma"] = self.indicators.volume_sma(
+            df["volume"], self.parameters.volume_period
+        )
+
+    def _calc_rest(self, df: pd.DataFrame):
+        """Calculate the indicators used for scoring and risk levels."""
         # EMAs
         df["ema_fast"] = self.indicators.ema(df["close"], self.parameters.ema_fast)
         df["ema_slow"] = self.indicators.ema(df["close"], self.parameters.ema_slow)
@@ -271,11 +788,6 @@ class NOICEStrategy(BaseStrategy):
             df["high"], df["low"], df["close"], self.parameters.atr_period
         )
 
-        # Volume indicators
-        df["volume_sma"] = self.indicators.volume_sma(
-            df["volume"], self.parameters.volume_period
-        )
-
         # Stochastic
         stoch_k, stoch_d = self.indicators.stochastic(
             df["high"], df["low"], df["close"]
@@ -283,110 +795,93 @@ class NOICEStrategy(BaseStrategy):
         df["stoch_k"] = stoch_k
         df["stoch_d"] = stoch_d
 
-    def _check_volume_confirmation(self, current: pd.Series) -> bool:
+    def _check_volume_confirmation(self, volume: float, volume_sma: float) -> bool:
         """Check if current volume meets minimum requirements."""
-        if pd.isna(current["volume_sma"]):
+        if math.isnan(volume_sma):
             return False
 
-        volume_ratio = current["volume"] / current["volume_sma"]
+        volume_ratio = volume / volume_sma
         return volume_ratio >= self.parameters.min_volume_multiplier
 
     def _analyze_bullish_conditions(
-        self, current: pd.Series, previous: pd.Series, df: pd.DataFrame
+        self, current: Dict[str, Any], previous: Dict[str, Any]
     ) -> float:
         """Analyze bullish market conditions and return confidence score."""
-        score = 0.0
-        max_score = 6.0  # Total possible points
-
-        # 1. EMA Trend (1 point)
-        if (
-            current["close"] > current["ema_fast"]
-            and current["ema_fast"] > current["ema_slow"]
-        ):
-            score += 1.0
-
-        # 2. RSI Oversold (1 point)
-        if current["rsi"] < self.parameters.rsi_oversold:
-            score += 1.0
-        elif current["rsi"] < 45:  # Partial points for moderate RSI
-            score += 0.5
-
-        # 3. MACD Bullish Crossover (1.5 points)
-        if (
-            current["macd"] > current["macd_signal"]
-            and previous["macd"] <= previous["macd_signal"]
-        ):
-            score += 1.5
-        elif current["macd"] > current["macd_signal"]:
-            score += 0.5
-
-        # 4. Bollinger Bands (1 point)
-        if current["close"] <= current["bb_lower"]:
-            score += 1.0  # Oversold condition
-        elif current["close"] < current["bb_middle"]:
-            score += 0.3
-
-        # 5. Stochastic (1 point)
-        if current["stoch_k"] < 20 and current["stoch_d"] < 20:
-            score += 1.0
-        elif current["stoch_k"] < 50:
-            score += 0.3
-
-        # 6. Price momentum (0.5 points)
-        if current["close"] > previous["close"]:
-            score += 0.5
-
-        return min(score / max_score, 1.0)
+        close = current["close"]
+        rsi = current["rsi"]
+        macd_above = current["macd"] > current["macd_signal"]
+        crossover = macd_above and previous["macd"] <= previous["macd_signal"]
+        at_lower_band = close <= current["bb_lower"]
+        stoch_low = current["stoch_k"] < 20 and current["stoch_d"] < 20
+        rsi_oversold = rsi < self.parameters.rsi_oversold
+
+        # One entry per weight in self._bull_weights; the else-branches of
+        # each tier are spelled out so exactly one of them can score
+        conditions = np.array(
+            [
+                close > current["ema_fast"] and current["ema_fast"] > current["ema_slow"],
+                rsi_oversold,
+                not rsi_oversold and rsi < 45,
+                crossover,
+                not crossover and macd_above,
+                at_lower_band,
+                not at_lower_band and close < current["bb_middle"],
+                stoch_low,
+                not stoch_low and current["stoch_k"] < 50,
+                close > previous["close"],
+            ],
+            dtype=bool,
+        )
+
+        score = float(self._bull_weights @ conditions)
+        return min(score / self._max_score, 1.0)
 
     def _analyze_bearish_conditions(
-        self, current: pd.Series, previous: pd.Series, df: pd.DataFrame
+        self, current: Dict[str, Any], previous: Dict[str, Any]
     ) -> float:
         """Analyze bearish market conditions and return confidence score."""
-        score = 0.0
-        max_score = 6.0
-
-        # 1. EMA Trend (1 point)
-        if (
-            current["close"] < current["ema_fast"]
-            and current["ema_fast"] < current["ema_slow"]
-        ):
-            score += 1.0
-
-        # 2. RSI Overbought (1 point)
-        if current["rsi"] > self.parameters.rsi_overbought:
-            score += 1.0
-        elif current["rsi"] > 55:
-            score += 0.5
-
-        # 3. MACD Bearish Crossover (1.5 points)
-        if (
-            current["macd"] < current["macd_signal"]
-            and previous["macd"] >= previous["macd_signal"]
-        ):
-            score += 1.5
-        elif current["macd"] < current["macd_signal"]:
-            score += 0.5
-
-        # 4. Bollinger Bands (1 point)
-        if current["close"] >= current["bb_upper"]:
-            score += 1.0  # Overbought condition
-        elif current["close"] > current["bb_middle"]:
-            score += 0.3
-
-        # 5. Stochastic (1 point)
-        if current["stoch_k"] > 80 and current["stoch_d"] > 80:
-            score += 1.0
-        elif current["stoch_k"] > 50:
-            score += 0.3
-
-        # 6. Price momentum (0.5 points)
-        if current["close"] < previous["close"]:
-            score += 0.5
-
-        return min(score / max_score, 1.0)
+        close = current["close"]
+        rsi = current["rsi"]
+        macd_below = current["macd"] < current["macd_signal"]
+        crossover = macd_below and previous["macd"] >= previous["macd_signal"]
+        at_upper_band = close >= current["bb_upper"]
+        stoch_high = current["stoch_k"] > 80 and current["stoch_d"] > 80
+        rsi_overbought = rsi > self.parameters.rsi_overbought
+
+        conditions = np.array(
+            [
+                close < current["ema_fast"] and current["ema_fast"] < current["ema_slow"],
+                rsi_overbought,
+                not rsi_overbought and rsi > 55,
+                crossover,
+                not crossover and macd_below,
+                at_upper_band,
+                not at_upper_band and close > current["bb_middle"],
+                stoch_high,
+                not stoch_high and current["stoch_k"] > 50,
+                close < previous["close"],
+            ],
+            dtype=bool,
+        )
+
+        score = float(self._bear_weights @ conditions)
+        return min(score / self._max_score, 1.0)
+
+    def _signal_time(self, current: Dict[str, Any]) -> datetime:
+        """Timestamp for a signal generated from the given bar."""
+        if self._use_wall_clock:
+            return datetime.now()
+        return current["timestamp"]
+
+    def _make_metadata(self, current: Dict[str, Any]) -> Dict[str, Any]:
+        """Build metadata for a buy/sell signal; hold signals carry none."""
+        return {
+            "strategy": "NOICEStrategy",
+            "indicators": {key: current[key] for key in self._META_KEYS},
+        }
 
     def _create_buy_signal(
-        self, current: pd.Series, confidence: float, df: pd.DataFrame
+        self, current: Dict[str, Any], confidence: float
     ) -> TradingSignal:
         """Create a buy signal with proper risk management."""
         entry_price = current["close"]
@@ -419,22 +914,12 @@ class NOICEStrategy(BaseStrategy):
             take_profit_2=tp2,
             confidence=confidence,
             reason=" | ".join(reason_parts),
-            timestamp=datetime.now(),
-            metadata={
-                "strategy": "NOICEStrategy",
-                "indicators": {
-                    "ema_fast": current["ema_fast"],
-                    "ema_slow": current["ema_slow"],
-                    "rsi": current["rsi"],
-                    "macd": current["macd"],
-                    "macd_signal": current["macd_signal"],
-                    "atr": current["atr"],
-                },
-            },
+            timestamp=self._signal_time(current),
+            metadata=self._make_metadata(current),
         )
 
     def _create_sell_signal(
-        self, current: pd.Series, confidence: float, df: pd.DataFrame
+        self, current: Dict[str, Any], confidence: float
     ) -> TradingSignal:
         """Create a sell signal with proper risk management."""
         entry_price = current["close"]
@@ -466,21 +951,13 @@ class NOICEStrategy(BaseStrategy):
             take_profit_2=tp2,
             confidence=confidence,
             reason=" | ".join(reason_parts),
-            timestamp=datetime.now(),
-            metadata={
-                "strategy": "NOICEStrategy",
-                "indicators": {
-                    "ema_fast": current["ema_fast"],
-                    "ema_slow": current["ema_slow"],
-                    "rsi": current["rsi"],
-                    "macd": current["macd"],
-                    "macd_signal": current["macd_signal"],
-                    "atr": current["atr"],
-                },
-            },
+            timestamp=self._signal_time(current),
+            metadata=self._make_metadata(current),
         )
 
-    def _create_hold_signal(self, current: pd.Series, reason: str) -> TradingSignal:
+    def _create_hold_signal(
+        self, current: Dict[str, Any], reason: str
+    ) -> TradingSignal:
         """Create a hold signal."""
         return TradingSignal(
             signal_type=SignalType.HOLD,
@@ -492,5 +969,5 @@ class NOICEStrategy(BaseStrategy):
             take_profit_2=0.0,
             confidence=0.0,
             reason=reason,
-            timestamp=datetime.now(),
+            timestamp=self._signal_time(current),
         )
@@ -2,11 +2,103 @@
 Trend following strategy implementation.
 """
 
-from typing import Dict, Any, Optional
+import math
+from collections import OrderedDict
+from typing import Dict, Any, Hashable, Optional
 import pandas as pd
 import numpy as np
 
 from .base_strategy import BaseStrategy, StrategySignal, SignalType
+from ._jit import HAS_NUMBA
+from ._kernels import make_trend_update, move_mean, rsi_wilder
+
+VOLUME_MA_PERIOD = 20
+
+# Highest price for which float32_indicators is honoured
+FLOAT32_MAX_PRICE = 1e7
+
+# Per-symbol streaming states kept before the least recently used is dropped
+MAX_TRACKED_SYMBOLS = 256
+
+
+class TrendStreamingIndicators:
+    """
+    Incremental indicator state for one symbol.
+
+    push() folds one bar into running window sums and Wilder averages, so the
+    per-bar cost does not depend on the length of the history. The state is
+    always float64; values match TrendFollowingStrategy.calculate_indicators
+    over the same bars when float32_indicators is off.
+    """
+
+    __slots__ = (
+        'fast_period', 'slow_period', 'rsi_period', '_update', 'count', 'key',
+        'close', 'volume', 'first_key', 'first_close', 'state', 'closes',
+        'volumes', 'current', 'previous',
+    )
+
+    def __init__(self, fast_period: int, slow_period: int, rsi_period: int):
+        self.fast_period = fast_period
+        self.slow_period = slow_period
+        self.rsi_period = rsi_period
+        # Update kernel compiled with these periods as constants
+        self._update = make_trend_update(
+            fast_period, slow_period, rsi_period, VOLUME_MA_PERIOD
+        )
+        self.reset()
+
+    def reset(self):
+        """Clear all running state."""
+        self.count = 0
+        self.key = None
+        self.close = None
+        self.volume = None
+
+        # Key and close of the first bar, to recognise the same history later
+        self.first_key = None
+        self.first_close = None
+
+        # Running sums, Wilder averages and ring buffers (see make_trend_update)
+        self.state = np.zeros(7)
+        self.closes = np.zeros(max(self.fast_period, self.slow_period))
+        self.volumes = np.zeros(VOLUME_MA_PERIOD)
+
+        # Indicator values of the latest and previous bar
+        self.current: Optional[Dict[str, float]] = None
+        self.previous: Optional[Dict[str, float]] = None
+
+    def push(self, close: float, volume: float, key: Hashable = None):
+        """
+        Fold one bar into the running state.
+
+        Args:
+            close: Close price of the bar
+            volume: Volume of the bar
+            key: Identifier of the bar (e.g. its timestamp)
+        """
+        close = float(close)
+        volume = float(volume)
+        fast_ma, slow_ma, volume_ma, rsi = self._update(
+            self.state, self.closes, self.volumes, close, volume
+        )
+
+        if not self.count:
+            self.first_key = key
+            self.first_close = close
+        self.count += 1
+        self.key = key
+        self.close = close
+        self.volume = volume
+        self.previous = self.current
+        self.current = {
+            'close': close,
+            'volume': volume,
+            'fast_ma': fast_ma,
+            'slow_ma': slow_ma,
+            'rsi': rsi,
+            'volume_ma': volume_ma,
+            'trend_strength': (fast_ma - slow_ma) / slow_ma,
+        }
 
 
 class TrendFollowingStrategy(BaseStrategy):
@@ -19,6 +111,12 @@ class TrendFollowingStrategy(BaseStrategy):
     - Use RSI and volume for confirmation
     """
 
+    __slots__ = (
+        'fast_period', 'slow_period', 'rsi_period', 'rsi_overbought',
+        'rsi_oversold', 'min_confidence', 'stop_loss_pct', 'take_profit_pct',
+        'float32_indicators', '_state',
+    )
+
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         """
         Initialize trend following strategy.
@@ -32,6 +130,11 @@ class TrendFollowingStrategy(BaseStrategy):
             min_confidence: Minimum confidence threshold (default: 0.6)
             stop_loss_pct: Stop loss percentage (default: 0.02)
             take_profit_pct: Take profit percentage (default: 0.04)
+            float32_indicators: Compute moving averages on float32 arrays in
+                calculate_indicators and generate_signals_batch (default:
+                False). Batch/backtest only: generate_signal always uses the
+                float64 streaming state, so with this on a crossover that is
+                within float32 rounding can differ between the two paths.
         """
         super().__init__("TrendFollowing", config)
 
@@ -44,35 +147,69 @@ class TrendFollowingStrategy(BaseStrategy):
         self.min_confidence = self.config.get('min_confidence', 0.6)
         self.stop_loss_pct = self.config.get('stop_loss_pct', 0.02)
         self.take_profit_pct = self.config.get('take_profit_pct', 0.04)
+        self.float32_indicators = self.config.get('float32_indicators', False)
+
+        # Per-symbol incremental indicator state, in least recently used order
+        self._state: "OrderedDict[str, TrendStreamingIndicators]" = OrderedDict()
 
     def calculate_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
         """Calculate technical indicators."""
-        df = df.copy()
+        return df.assign(**self._indicator_arrays(df))
 
-        # Moving averages
-        df['fast_ma'] = df['close'].rolling(window=self.fast_period).mean()
-        df['slow_ma'] = df['close'].rolling(window=self.slow_period).mean()
+    def _indicator_arrays(self, df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """
+        Calculate the indicator columns as NumPy arrays.
 
-        # RSI
-        df['rsi'] = self._calculate_rsi(df['close'], self.rsi_period)
+        Args:
+            df: OHLCV data
 
-        # Volume MA
-        df['volume_ma'] = df['volume'].rolling(window=20).mean()
+        Returns:
+            Dict of indicator name -> array aligned with the rows of df
+        """
+        close = df['close'].to_numpy(dtype=np.float64)
+        volume = df['volume'].to_numpy(dtype=np.float64)
 
-        # Trend strength (distance between MAs)
-        df['trend_strength'] = (df['fast_ma'] - df['slow_ma']) / df['slow_ma']
+        # float32 halves the memory traffic of the moving averages, but above
+        # FLOAT32_MAX_PRICE its 24-bit mantissa is too coarse for prices
+        if self.float32_indicators and not (close > FLOAT32_MAX_PRICE).any():
+            close = close.astype(np.float32)
+            volume = volume.astype(np.float32)
 
-        return df
+        # Moving averages
+        fast_ma = move_mean(close, self.fast_period)
+        slow_ma = move_mean(close, self.slow_period)
+
+        return {
+            'fast_ma': fast_ma,
+            'slow_ma': slow_ma,
+            'rsi': self._calculate_rsi(df['close'], self.rsi_period).to_numpy(),
+            'volume_ma': move_mean(volume, VOLUME_MA_PERIOD),
+            # Trend strength (distance between MAs)
+            'trend_strength': (fast_ma - slow_ma) / slow_ma,
+        }
 
     def _calculate_rsi(self, prices: pd.Series, period: int) -> pd.Series:
-        """Calculate RSI indicator."""
+        """Calculate RSI indicator with Wilder smoothing."""
+        if HAS_NUMBA:
+            rsi = rsi_wilder(prices.to_numpy(dtype=np.float64, copy=False), period)
+            return pd.Series(rsi, index=prices.index)
+
+        # Without Numba the kernel runs as plain Python, so let pandas do the
+        # recursion: ewm(alpha=1/period, adjust=False) is Wilder's update, and
+        # starting it from the mean of the first `period` values reproduces
+        # the kernel's seed.
+        if len(prices) <= period:
+            return pd.Series(np.nan, index=prices.index)
+
         delta = prices.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
+        averages = []
+        for values in (delta.clip(lower=0), -delta.clip(upper=0)):
+            values.iloc[period] = values.iloc[1:period + 1].mean()
+            values.iloc[:period] = np.nan
+            averages.append(values.ewm(alpha=1.0 / period, adjust=False).mean())
 
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
+        rs = averages[0] / averages[1]
+        return 100 - (100 / (1 + rs))
 
     def generate_signal(
         self,
@@ -86,35 +223,31 @@ class TrendFollowingStrategy(BaseStrategy):
         if historical_data is None or len(historical_data) < self.slow_period + 1:
             return None
 
-        # Calculate indicators
-        df = self.calculate_indicators(historical_data)
-
-        # Get recent data
-        current = df.iloc[-1]
-        previous = df.iloc[-2]
+        # Advance the symbol's indicator state to the latest bar
+        state = self._update_state(symbol, historical_data)
+        current = state.current
+        fast_ma = current['fast_ma']
+        slow_ma = current['slow_ma']
+        prev_fast_ma = state.previous['fast_ma']
+        prev_slow_ma = state.previous['slow_ma']
 
         # Check for NaN values
-        if pd.isna(current['fast_ma']) or pd.isna(current['slow_ma']):
+        if math.isnan(fast_ma) or math.isnan(slow_ma):
             return None
 
-        current_price = market_data.get('price', current['close'])
-
-        # Detect crossovers
-        golden_cross = (
-            previous['fast_ma'] <= previous['slow_ma'] and
-            current['fast_ma'] > current['slow_ma']
-        )
-
-        death_cross = (
-            previous['fast_ma'] >= previous['slow_ma'] and
-            current['fast_ma'] < current['slow_ma']
-        )
+        # Detect crossovers; most bars have none, so stop before any
+        # confidence, price or metadata work
+        golden_cross = prev_fast_ma <= prev_slow_ma and fast_ma > slow_ma
+        death_cross = prev_fast_ma >= prev_slow_ma and fast_ma < slow_ma
+        if not (golden_cross or death_cross):
+            return None
 
+        current_price = market_data.get('price', current['close'])
         signal = None
 
         # Buy signal (golden cross)
         if golden_cross:
-            confidence = self._calculate_buy_confidence(current, df)
+            confidence = self._calculate_buy_confidence(current)
 
             if confidence >= self.min_confidence:
                 stop_loss = current_price * (1 - self.stop_loss_pct)
@@ -128,17 +261,12 @@ class TrendFollowingStrategy(BaseStrategy):
                     quantity=0,  # Will be calculated by position sizing
                     stop_loss=stop_loss,
                     take_profit=take_profit,
-                    metadata={
-                        'fast_ma': current['fast_ma'],
-                        'slow_ma': current['slow_ma'],
-                        'rsi': current['rsi'],
-                        'trend_strength': current['trend_strength']
-                    }
+                    metadata=self._signal_metadata(current)
                 )
 
         # Sell signal (death cross)
         elif death_cross:
-            confidence = self._calculate_sell_confidence(current, df)
+            confidence = self._calculate_sell_confidence(current)
 
             if confidence >= self.min_confidence:
                 signal = StrategySignal(
@@ -147,50 +275,158 @@ class TrendFollowingStrategy(BaseStrategy):
                     confidence=confidence,
                     entry_price=current_price,
                     quantity=0,
-                    metadata={
-                        'fast_ma': current['fast_ma'],
-                        'slow_ma': current['slow_ma'],
-                        'rsi': current['rsi'],
-                        'trend_strength': current['trend_strength']
-                    }
+                    metadata=self._signal_metadata(current)
                 )
 
         self._record_signal(signal)
         return signal
 
-    def _calculate_buy_confidence(self, current: pd.Series, df: pd.DataFrame) -> float:
+    def generate_signals_batch(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Evaluate the signal logic for every bar of a history in one sweep.
+
+        Indicators are calculated once over the whole frame and crossovers
+        and confidence are evaluated as vectorized masks, giving the same
+        result as calling generate_signal on each growing prefix of the
+        history. With float32_indicators on, the moving averages are float32
+        here while generate_signal stays float64, so crossovers closer than
+        float32 rounding may be classified differently.
+
+        Args:
+            df: OHLCV history with 'close' and 'volume' columns
+
+        Returns:
+            int8 array per bar: 1 = buy, -1 = sell, 0 = no signal
+        """
+        ind = self._indicator_arrays(df)
+        fast_ma = ind['fast_ma']
+        slow_ma = ind['slow_ma']
+        rsi = ind['rsi']
+        trend_strength = ind['trend_strength']
+        volume_confirmed = df['volume'].to_numpy(dtype=np.float64) > ind['volume_ma']
+
+        golden_cross = np.zeros(len(df), dtype=bool)
+        death_cross = np.zeros(len(df), dtype=bool)
+        golden_cross[1:] = (fast_ma[:-1] <= slow_ma[:-1]) & (fast_ma[1:] > slow_ma[1:])
+        death_cross[1:] = (fast_ma[:-1] >= slow_ma[:-1]) & (fast_ma[1:] < slow_ma[1:])
+        # generate_signal needs slow_period + 1 bars of history
+        golden_cross[:self.slow_period] = False
+        death_cross[:self.slow_period] = False
+
+        # Same additions, in the same order, as the scalar confidence code
+        buy_conf = np.full(len(df), 0.5)
+        buy_conf += 0.2 * (rsi < self.rsi_overbought)
+        buy_conf += 0.15 * volume_confirmed
+        buy_conf += 0.15 * (trend_strength > 0.02)
+
+        sell_conf = np.full(len(df), 0.5)
+        sell_conf += 0.2 * (rsi > self.rsi_oversold)
+        sell_conf += 0.15 * volume_confirmed
+        sell_conf += 0.15 * (trend_strength < -0.02)
+
+        buy = golden_cross & (np.minimum(buy_conf, 1.0) >= self.min_confidence)
+        sell = death_cross & (np.minimum(sell_conf, 1.0) >= self.min_confidence)
+
+        return np.where(buy, 1, np.where(sell, -1, 0)).astype(np.int8)
+
+    def _signal_metadata(self, current: Dict[str, float]) -> Dict[str, Any]:
+        """Build signal metadata; only called once a signal is accepted."""
+        return {
+            'fast_ma': current['fast_ma'],
+            'slow_ma': current['slow_ma'],
+            'rsi': current['rsi'],
+            'trend_strength': current['trend_strength']
+        }
+
+    def _update_state(self, symbol: str, df: pd.DataFrame) -> TrendStreamingIndicators:
+        """
+        Bring the symbol's indicator state up to the last bar of df.
+
+        Bars are identified by the 'timestamp' column when present, otherwise
+        by the index. The state is reused only when df starts with the same
+        first bar and either ends with the bar last pushed (same length, key,
+        close and volume) or adds exactly one bar after it; in the second case
+        only the new bar is pushed. Anything else, such as a revised last bar
+        or a fixed-length window sliding forward, is replayed from scratch, so
+        the state always matches calculate_indicators over df (computed in
+        float64, whatever float32_indicators is set to).
+        At most MAX_TRACKED_SYMBOLS states are kept; the least recently used
+        symbol is replayed from scratch if it comes back.
+        """
+        keys = df['timestamp'] if 'timestamp' in df.columns else df.index
+        if not isinstance(keys, pd.Index):
+            keys = keys.array
+        closes = df['close']
+        volumes = df['volume']
+        n = len(df)
+
+        state = self._state.get(symbol)
+        if state is not None:
+            self._state.move_to_end(symbol)
+            if (
+                state.count
+                and state.first_key == keys[0]
+                and state.first_close == float(closes.iat[0])
+            ):
+                if (
+                    state.count == n
+                    and state.key == keys[-1]
+                    and state.close == float(closes.iat[-1])
+                    and state.volume == float(volumes.iat[-1])
+                ):
+                    return state
+
+                if (
+                    state.count == n - 1
+                    and state.key == keys[-2]
+                    and state.close == float(closes.iat[-2])
+                    and state.volume == float(volumes.iat[-2])
+                ):
+                    state.push(closes.iat[-1], volumes.iat[-1], keys[-1])
+                    return state
+
+        state = TrendStreamingIndicators(
+            self.fast_period, self.slow_period, self.rsi_period
+        )
+        for close, volume, key in zip(
+            closes.to_numpy(dtype=np.float64),
+            volumes.to_numpy(dtype=np.float64),
+            keys,
+        ):
+            state.push(close, volume, key)
+        self._state[symbol] = state
+        self._state.move_to_end(symbol)
+        if len(self._state) > MAX_TRACKED_SYMBOLS:
+            self._state.popitem(last=False)
+        return state
+
+    def _calculate_buy_confidence(self, current: Dict[str, float]) -> float:
         """Calculate confidence for buy signal."""
         confidence = 0.5  # Base confidence
 
         # RSI confirmation (not overbought)
-        if current['rsi'] < self.rsi_overbought:
-            confidence += 0.2
+        confidence += 0.2 * (current['rsi'] < self.rsi_overbought)
 
         # Volume confirmation (above average)
-        if current['volume'] > current['volume_ma']:
-            confidence += 0.15
+        confidence += 0.15 * (current['volume'] > current['volume_ma'])
 
         # Strong trend
-        if current['trend_strength'] > 0.02:
-            confidence += 0.15
+        confidence += 0.15 * (current['trend_strength'] > 0.02)
 
         return min(confidence, 1.0)
 
-    def _calculate_sell_confidence(self, current: pd.Series, df: pd.DataFrame) -> float:
+    def _calculate_sell_confidence(self, current: Dict[str, float]) -> float:
         """Calculate confidence for sell signal."""
         confidence = 0.5  # Base confidence
 
         # RSI confirmation (not oversold)
-        if current['rsi'] > self.rsi_oversold:
-            confidence += 0.2
+        confidence += 0.2 * (current['rsi'] > self.rsi_oversold)
 
         # Volume confirmation
-        if current['volume'] > current['volume_ma']:
-            confidence += 0.15
+        confidence += 0.15 * (current['volume'] > current['volume_ma'])
 
         # Weak/negative trend
-        if current['trend_strength'] < -0.02:
-            confidence += 0.15
+        confidence += 0.15 * (current['trend_strength'] < -0.02)
 
         return min(confidence, 1.0)
 
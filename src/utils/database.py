@@ -3,9 +3,10 @@ Database manager for storing trading data and analytics.
 Supports SQLite and PostgreSQL with async operations.
 """
 
-import sqlite3
-from datetime import datetime, timezone
-from typing import Optional, Dict, Any, List, Union
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, Any, Iterable, List, Union
 from pathlib import Path
 import json
 
@@ -14,8 +15,90 @@ try:
 except ImportError:
     asyncpg = None
 
+try:
+    import aiosqlite
+except ImportError:
+    aiosqlite = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from ..core.config_manager import DatabaseConfig
 
+# Hot-path statements. Keeping each one a single constant string lets
+# asyncpg's per-connection statement cache reuse its prepared statement.
+SIGNAL_INSERT_SQL = """
+INSERT INTO signals (
+    symbol, signal_type, price, stop_loss, take_profit_1,
+    take_profit_2, confidence, reason, metadata, timestamp
+) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10)
+"""
+
+SIGNAL_SQL = SIGNAL_INSERT_SQL + "RETURNING id\n"
+
+TRADE_OPEN_SQL = """
+INSERT INTO trades (
+    symbol, side, entry_price, quantity, stop_loss,
+    take_profit_1, take_profit_2, opened_at, signal_reason,
+    confidence, strategy, metadata
+) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12)
+"""
+
+TRADE_TP1_SQL = """
+UPDATE trades SET tp1_hit = TRUE, metadata = $2
+WHERE symbol = $1 AND closed_at IS NULL
+"""
+
+TRADE_CLOSE_SQL = """
+UPDATE trades SET
+    exit_price = $2, closed_at = $3, pnl = $4, pnl_pct = $5,
+    exit_reason = $6, tp2_hit = $7, metadata = $8
+WHERE symbol = $1 AND closed_at IS NULL
+"""
+
+SYSTEM_METRICS_SQL = """
+INSERT INTO system_metrics (
+    cpu_usage, memory_usage, cpu_temp, disk_usage,
+    network_sent, network_recv, timestamp
+) VALUES ($1, $2, $3, $4, $5, $6, $7)
+"""
+
+OHLCV_SQL = """
+INSERT INTO ohlcv_data (
+    symbol, timestamp, open_price, high_price, low_price,
+    close_price, volume, source
+) VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
+ON CONFLICT (symbol, timestamp, source) DO NOTHING
+"""
+
+# Columns of the trades table; get_trade_history only selects from these
+TRADE_COLUMNS = (
+    "id", "symbol", "side", "entry_price", "exit_price", "quantity",
+    "stop_loss", "take_profit_1", "take_profit_2", "tp1_hit", "tp2_hit",
+    "opened_at", "closed_at", "pnl", "pnl_pct", "exit_reason",
+    "signal_reason", "confidence", "strategy", "metadata", "created_at",
+)
+
+# Default projection skips the metadata blob
+TRADE_HISTORY_COLUMNS = tuple(c for c in TRADE_COLUMNS if c != "metadata")
+
+# Queued signals are written in batches of up to SIGNAL_BATCH_SIZE rows, at
+# most SIGNAL_FLUSH_INTERVAL seconds after the first row of a batch arrived
+SIGNAL_QUEUE_SIZE = 10_000
+SIGNAL_BATCH_SIZE = 500
+SIGNAL_FLUSH_INTERVAL = 0.05
+
+
+def _dumps(obj: Any) -> str:
+    """Serialize metadata to a JSON string, using orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(
+            obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        ).decode()
+    return json.dumps(obj)
+
 
 class DatabaseManager:
     """
@@ -33,6 +116,13 @@ class DatabaseManager:
         self.config = config
         self.pool: Optional[Any] = None
         self.sqlite_path: Optional[Path] = None
+        self._sqlite_conn: Optional[Any] = None
+        self._sqlite_lock = asyncio.Lock()
+        self.logger = logging.getLogger(__name__)
+
+        # Signals queued by queue_signal, written by _flush_signals
+        self._signal_queue: asyncio.Queue = asyncio.Queue(maxsize=SIGNAL_QUEUE_SIZE)
+        self._signal_task: Optional[asyncio.Task] = None
 
         # Determine database type
         if config.host == "localhost" and hasattr(config, "path"):
@@ -44,16 +134,41 @@ class DatabaseManager:
     async def initialize(self):
         """Initialize database connections and create tables."""
         if self.use_sqlite:
-            self._init_sqlite()
+            await self._init_sqlite()
         else:
             await self._init_postgresql()
 
-        await self._create_tables()
-
-    def _init_sqlite(self):
-        """Initialize SQLite database."""
-        if self.sqlite_path:
-            self.sqlite_path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            await self._create_tables()
+        except BaseException:
+            # aiosqlite's connection thread is not a daemon and would keep
+            # the interpreter alive after a failed start
+            await self._close_connections()
+            raise
+
+        self._signal_task = asyncio.create_task(self._flush_signals())
+
+    async def _init_sqlite(self):
+        """Initialize SQLite database and its persistent connection."""
+        if not aiosqlite:
+            raise ImportError("aiosqlite is required for SQLite support")
+
+        self.sqlite_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # One autocommit connection for the lifetime of the manager. aiosqlite
+        # runs the sqlite3 calls on its own thread so writes do not block the
+        # event loop, and WAL lets readers proceed while a write is in progress
+        conn = await aiosqlite.connect(str(self.sqlite_path), isolation_level=None)
+        try:
+            conn.row_factory = aiosqlite.Row
+            await conn.execute("PRAGMA journal_mode=WAL")
+            await conn.execute("PRAGMA synchronous=NORMAL")
+            await conn.execute("PRAGMA cache_size=-64000")
+            await conn.execute("PRAGMA temp_store=MEMORY")
+        except BaseException:
+            await conn.close()
+            raise
+        self._sqlite_conn = conn
 
     async def _init_postgresql(self):
         """Initialize PostgreSQL connection pool."""
@@ -70,10 +185,19 @@ class DatabaseManager:
                 min_size=2,
                 max_size=10,
                 command_timeout=60,
+                statement_cache_size=1024,
+                init=self._init_connection,
             )
         except Exception as e:
             raise ConnectionError(f"Failed to connect to PostgreSQL: {e}")
 
+    @staticmethod
+    async def _init_connection(conn):
+        """Decode NUMERIC columns straight to float on every pooled connection."""
+        await conn.set_type_codec(
+            "numeric", encoder=str, decoder=float, schema="pg_catalog", format="text"
+        )
+
     async def _create_tables(self):
         """Create necessary database tables."""
         schema_sql = """
@@ -158,6 +282,11 @@ class DatabaseManager:
                 "CREATE INDEX IF NOT EXISTS idx_trades_symbol_opened "
                 "ON trades(symbol, opened_at DESC);"
             ),
+            (
+                # Partial index for the open-trade lookups in _log_trade_close
+                "CREATE INDEX IF NOT EXISTS idx_trades_open "
+                "ON trades(symbol) WHERE closed_at IS NULL;"
+            ),
             (
                 "CREATE INDEX IF NOT EXISTS idx_ohlcv_symbol_timestamp "
                 "ON ohlcv_data(symbol, timestamp DESC);"
@@ -187,9 +316,8 @@ class DatabaseManager:
             sqlite_sql = sqlite_sql.replace("BIGINT", "INTEGER")
             sqlite_sql = sqlite_sql.replace("CURRENT_TIMESTAMP", "datetime('now')")
 
-            if self.sqlite_path:
-                with sqlite3.connect(str(self.sqlite_path)) as conn:
-                    conn.executescript(sqlite_sql)
+            async with self._sqlite_lock:
+                await self._sqlite_conn.executescript(sqlite_sql)
         else:
             if self.pool:
                 async with self.pool.acquire() as conn:
@@ -197,15 +325,28 @@ class DatabaseManager:
 
     async def log_signal(self, signal_data: Dict[str, Any]) -> int:
         """Log trading signal to database."""
-        sql = """
-        INSERT INTO signals (
-            symbol, signal_type, price, stop_loss, take_profit_1,
-            take_profit_2, confidence, reason, metadata, timestamp
-        ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10)
-        RETURNING id
+        result = await self._execute_returning(
+            SIGNAL_SQL, self._signal_values(signal_data)
+        )
+        return result if result is not None else 0
+
+    async def queue_signal(self, signal_data: Dict[str, Any]):
         """
+        Queue a trading signal for a batched write.
 
-        values = (
+        Unlike log_signal this does not wait for the database or return the
+        row id; queued signals are written in order by a background task.
+        Waits only when the queue is full.
+
+        Args:
+            signal_data: Signal dict in the format accepted by log_signal
+        """
+        await self._signal_queue.put(self._signal_values(signal_data))
+
+    @staticmethod
+    def _signal_values(signal_data: Dict[str, Any]) -> tuple:
+        """Bind values for SIGNAL_INSERT_SQL."""
+        return (
             signal_data.get("symbol"),
             signal_data.get("signal_type"),
             signal_data.get("price"),
@@ -214,12 +355,43 @@ class DatabaseManager:
             signal_data.get("take_profit_2"),
             signal_data.get("confidence"),
             signal_data.get("reason"),
-            json.dumps(signal_data.get("metadata", {})),
+            _dumps(signal_data.get("metadata", {})),
             signal_data.get("timestamp"),
         )
 
-        result = await self._execute_returning(sql, values)
-        return result if result is not None else 0
+    async def _flush_signals(self):
+        """Write queued signals in batches until close() sends None."""
+        loop = asyncio.get_running_loop()
+        queue = self._signal_queue
+        running = True
+
+        while running:
+            row = await queue.get()
+            if row is None:
+                break
+
+            batch = [row]
+            deadline = loop.time() + SIGNAL_FLUSH_INTERVAL
+            while len(batch) < SIGNAL_BATCH_SIZE:
+                try:
+                    row = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        row = await asyncio.wait_for(queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                if row is None:
+                    running = False
+                    break
+                batch.append(row)
+
+            try:
+                await self._execute_many(SIGNAL_INSERT_SQL, batch)
+            except Exception as e:
+                self.logger.error(f"Failed to write {len(batch)} queued signals: {e}")
 
     async def log_trade_event(self, trade_data: Dict[str, Any]):
         """Log trade event (open/close position)."""
@@ -235,14 +407,6 @@ class DatabaseManager:
         position = trade_data.get("position", {})
         signal = trade_data.get("signal", {})
 
-        sql = """
-        INSERT INTO trades (
-            symbol, side, entry_price, quantity, stop_loss,
-            take_profit_1, take_profit_2, opened_at, signal_reason,
-            confidence, strategy, metadata
-        ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12)
-        """
-
         values = (
             position.get("symbol"),
             position.get("side"),
@@ -255,10 +419,10 @@ class DatabaseManager:
             signal.get("reason"),
             signal.get("confidence"),
             position.get("strategy"),
-            json.dumps(trade_data),
+            _dumps(trade_data),
         )
 
-        await self._execute(sql, values)
+        await self._execute(TRADE_OPEN_SQL, values)
 
     async def _log_trade_close(self, trade_data: Dict[str, Any]):
         """Log closing of trade position."""
@@ -266,18 +430,10 @@ class DatabaseManager:
         action = trade_data.get("action")
 
         if action == "take_profit_1":
-            sql = """
-            UPDATE trades SET tp1_hit = TRUE, metadata = $2
-            WHERE symbol = $1 AND closed_at IS NULL
-            """
-            values = (position.get("symbol"), json.dumps(trade_data))
+            sql = TRADE_TP1_SQL
+            values = (position.get("symbol"), _dumps(trade_data))
         else:
-            sql = """
-            UPDATE trades SET
-                exit_price = $2, closed_at = $3, pnl = $4, pnl_pct = $5,
-                exit_reason = $6, tp2_hit = $7, metadata = $8
-            WHERE symbol = $1 AND closed_at IS NULL
-            """
+            sql = TRADE_CLOSE_SQL
             values = (
                 position.get("symbol"),
                 position.get("current_price"),
@@ -286,22 +442,31 @@ class DatabaseManager:
                 position.get("pnl_percentage", 0),
                 action,
                 action == "take_profit_2",
-                json.dumps(trade_data),
+                _dumps(trade_data),
             )
 
         await self._execute(sql, values)
 
     async def log_ohlcv_data(self, ohlcv_data: Dict[str, Any]):
         """Log OHLCV market data."""
-        sql = """
-        INSERT INTO ohlcv_data (
-            symbol, timestamp, open_price, high_price, low_price,
-            close_price, volume, source
-        ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
-        ON CONFLICT (symbol, timestamp, source) DO NOTHING
+        await self._execute(OHLCV_SQL, self._ohlcv_values(ohlcv_data))
+
+    async def log_ohlcv_batch(self, rows: List[Dict[str, Any]]):
         """
+        Log many OHLCV bars in one round trip.
 
-        values = (
+        Args:
+            rows: OHLCV dicts in the format accepted by log_ohlcv_data
+        """
+        if rows:
+            await self._execute_many(
+                OHLCV_SQL, [self._ohlcv_values(row) for row in rows]
+            )
+
+    @staticmethod
+    def _ohlcv_values(ohlcv_data: Dict[str, Any]) -> tuple:
+        """Bind values for OHLCV_SQL."""
+        return (
             ohlcv_data.get("symbol"),
             ohlcv_data.get("timestamp"),
             ohlcv_data.get("open"),
@@ -312,17 +477,8 @@ class DatabaseManager:
             ohlcv_data.get("source", "websocket"),
         )
 
-        await self._execute(sql, values)
-
     async def log_system_metrics(self, metrics: Dict[str, Any]):
         """Log system performance metrics."""
-        sql = """
-        INSERT INTO system_metrics (
-            cpu_usage, memory_usage, cpu_temp, disk_usage,
-            network_sent, network_recv, timestamp
-        ) VALUES ($1, $2, $3, $4, $5, $6, $7)
-        """
-
         values = (
             metrics.get("cpu_usage"),
             metrics.get("memory_usage"),
@@ -333,14 +489,32 @@ class DatabaseManager:
             metrics.get("timestamp", datetime.now(tz=timezone.utc)),
         )
 
-        await self._execute(sql, values)
+        await self._execute(SYSTEM_METRICS_SQL, values)
 
     async def get_trade_history(
-        self, limit: int = 50, symbol: Optional[str] = None
+        self,
+        limit: int = 50,
+        symbol: Optional[str] = None,
+        columns: Optional[Iterable[str]] = None,
     ) -> List[Dict]:
-        """Get recent trade history."""
-        sql = """
-        SELECT * FROM trades
+        """
+        Get recent trade history.
+
+        Args:
+            limit: Maximum number of trades to return
+            symbol: Only return trades for this symbol
+            columns: Columns to select (default: every column but metadata)
+
+        Returns:
+            List of trade rows, newest first
+        """
+        columns = TRADE_HISTORY_COLUMNS if columns is None else tuple(columns)
+        unknown = set(columns) - set(TRADE_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown trade columns: {sorted(unknown)}")
+
+        sql = f"""
+        SELECT {", ".join(columns)} FROM trades
         WHERE ($2 IS NULL OR symbol = $2)
         ORDER BY opened_at DESC
         LIMIT $1
@@ -351,8 +525,7 @@ class DatabaseManager:
     async def get_trading_stats(self, days: int = 30) -> Dict[str, Any]:
         """Get trading performance statistics."""
         if self.use_sqlite:
-            sql = (
-                """
+            sql = """
             SELECT 
                 COUNT(*) as total_trades,
                 SUM(CASE WHEN pnl > 0 THEN 1 ELSE 0 END) as winning_trades,
@@ -362,13 +535,11 @@ class DatabaseManager:
                 MIN(pnl) as max_loss,
                 AVG(confidence) as avg_confidence
             FROM trades 
-            WHERE opened_at >= datetime('now', '-%d days')
+            WHERE opened_at >= datetime('now', $1)
             """
-                % days
-            )
+            values = (f"-{int(days)} days",)
         else:
-            sql = (
-                """
+            sql = """
             SELECT 
                 COUNT(*) as total_trades,
                 COUNT(*) FILTER (WHERE pnl > 0) as winning_trades,
@@ -378,12 +549,11 @@ class DatabaseManager:
                 MIN(pnl) as max_loss,
                 AVG(confidence) as avg_confidence
             FROM trades 
-            WHERE opened_at >= NOW() - INTERVAL '%d days'
+            WHERE opened_at >= NOW() - $1::interval
             """
-                % days
-            )
+            values = (timedelta(days=int(days)),)
 
-        result = await self._fetch_one(sql)
+        result = await self._fetch_one(sql, values)
 
         if result:
             win_rate = 0
@@ -394,13 +564,11 @@ class DatabaseManager:
                 "total_trades": result["total_trades"],
                 "winning_trades": result["winning_trades"],
                 "win_rate": round(win_rate, 2),
-                "avg_pnl": (float(result["avg_pnl"]) if result["avg_pnl"] else 0),
-                "total_pnl": (float(result["total_pnl"]) if result["total_pnl"] else 0),
-                "max_win": (float(result["max_win"]) if result["max_win"] else 0),
-                "max_loss": (float(result["max_loss"]) if result["max_loss"] else 0),
-                "avg_confidence": (
-                    float(result["avg_confidence"]) if result["avg_confidence"] else 0
-                ),
+                "avg_pnl": result["avg_pnl"] or 0,
+                "total_pnl": result["total_pnl"] or 0,
+                "max_win": result["max_win"] or 0,
+                "max_loss": result["max_loss"] or 0,
+                "avg_confidence": result["avg_confidence"] or 0,
             }
 
         return {}
@@ -408,20 +576,36 @@ class DatabaseManager:
     async def _execute(self, sql: str, values: Optional[tuple] = None):
         """Execute SQL command."""
         if self.use_sqlite:
-            if self.sqlite_path:
-                with sqlite3.connect(str(self.sqlite_path)) as conn:
-                    conn.execute(sql, values or ())
+            async with self._sqlite_lock:
+                await self._sqlite_conn.execute(sql, values or ())
         else:
             if self.pool and values:
                 async with self.pool.acquire() as conn:
                     await conn.execute(sql, *values)
 
+    async def _execute_many(self, sql: str, rows: List[tuple]):
+        """Execute SQL command for each row in a single transaction."""
+        if self.use_sqlite:
+            async with self._sqlite_lock:
+                conn = self._sqlite_conn
+                await conn.execute("BEGIN")
+                try:
+                    await conn.executemany(sql, rows)
+                except Exception:
+                    await conn.execute("ROLLBACK")
+                    raise
+                await conn.execute("COMMIT")
+        else:
+            if self.pool:
+                async with self.pool.acquire() as conn:
+                    async with conn.transaction():
+                        await conn.executemany(sql, rows)
+
     async def _execute_returning(self, sql: str, values: tuple) -> Optional[int]:
         """Execute SQL command and return ID."""
         if self.use_sqlite:
-            if self.sqlite_path:
-                with sqlite3.connect(str(self.sqlite_path)) as conn:
-                    cursor = conn.execute(sql, values)
+            async with self._sqlite_lock:
+                async with self._sqlite_conn.execute(sql, values) as cursor:
                     return cursor.lastrowid
         else:
             if self.pool:
@@ -434,12 +618,10 @@ class DatabaseManager:
     ) -> Optional[Dict]:
         """Fetch single row."""
         if self.use_sqlite:
-            if self.sqlite_path:
-                with sqlite3.connect(str(self.sqlite_path)) as conn:
-                    conn.row_factory = sqlite3.Row
-                    cursor = conn.execute(sql, values or ())
-                    row = cursor.fetchone()
-                    return dict(row) if row else None
+            async with self._sqlite_lock:
+                async with self._sqlite_conn.execute(sql, values or ()) as cursor:
+                    row = await cursor.fetchone()
+                return dict(row) if row else None
         else:
             if self.pool:
                 async with self.pool.acquire() as conn:
@@ -450,11 +632,10 @@ class DatabaseManager:
     async def _fetch_all(self, sql: str, values: Optional[tuple] = None) -> List[Dict]:
         """Fetch all rows."""
         if self.use_sqlite:
-            if self.sqlite_path:
-                with sqlite3.connect(str(self.sqlite_path)) as conn:
-                    conn.row_factory = sqlite3.Row
-                    cursor = conn.execute(sql, values or ())
-                    return [dict(row) for row in cursor.fetchall()]
+            async with self._sqlite_lock:
+                async with self._sqlite_conn.execute(sql, values or ()) as cursor:
+                    rows = await cursor.fetchall()
+                return [dict(row) for row in rows]
         else:
             if self.pool:
                 async with self.pool.acquire() as conn:
@@ -464,5 +645,19 @@ class DatabaseManager:
 
     async def close(self):
         """Close database connections."""
+        # Write out any queued signals before the connections go away
+        if self._signal_task is not None:
+            await self._signal_queue.put(None)
+            await self._signal_task
+            self._signal_task = None
+
+        await self._close_connections()
+
+    async def _close_connections(self):
+        """Close the pool and SQLite connection; safe after a partial init."""
         if self.pool:
-            await self.pool.close()
+            pool, self.pool = self.pool, None
+            await pool.close()
+        if self._sqlite_conn is not None:
+            conn, self._sqlite_conn = self._sqlite_conn, None
+            await conn.close()
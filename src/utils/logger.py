@@ -3,12 +3,44 @@ Logging utilities for the trading bot.
 Provides structured logging with file rotation and multiple output formats.
 """
 
+import atexit
 import logging
 import logging.handlers
+import os
+import queue
+import re
+import stat
 import sys
+import time
 from pathlib import Path
-from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Write buffer and maximum flush delay of BufferedRotatingFileHandler
+LOG_BUFFER_SIZE = 64 * 1024
+LOG_FLUSH_INTERVAL = 1.0  # seconds
+
+# Log file size such as "10MB", "512 KB" or a plain byte count
+_SIZE_RE = re.compile(r"^\s*(\d+)\s*([KMG]?B)?\s*$", re.IGNORECASE)
+_SIZE_UNITS = {None: 1, "B": 1, "KB": 1 << 10, "MB": 1 << 20, "GB": 1 << 30}
+
+# Most records the background writer handles before flushing the files
+LOG_BATCH_SIZE = 512
+
+# Running timers kept by PerformanceLogger before the oldest are dropped
+MAX_TIMERS = 64
+
+# Returned by PerformanceLogger._pop_timer when no timer has the given name
+_NO_TIMER = object()
 
 
 class ColoredFormatter(logging.Formatter):
@@ -23,9 +55,325 @@ class ColoredFormatter(logging.Formatter):
     }
     RESET = "\033[0m"
 
+    def __init__(self, *args, use_color: Optional[bool] = None, **kwargs):
+        """
+        Args:
+            use_color: Whether to add color codes; defaults to whether stdout
+                is a terminal
+        """
+        super().__init__(*args, **kwargs)
+        if use_color is None:
+            use_color = sys.stdout.isatty()
+        self.use_color = use_color
+        self._level_colors = {
+            level: (color, self.RESET) for level, color in self.COLORS.items()
+        }
+        self._default = ("", self.RESET)
+
     def format(self, record):
         log_message = super().format(record)
-        return f"{self.COLORS.get(record.levelname, '')}{log_message}{self.RESET}"
+        # Set by _ColorTagger on the console handler
+        prefix = getattr(record, "_color_pre", None)
+        if prefix is not None:
+            return prefix + log_message + record._color_post
+        if not self.use_color:
+            return log_message
+        prefix, suffix = self._level_colors.get(record.levelname, self._default)
+        return prefix + log_message + suffix
+
+
+class _ColorTagger(logging.Filter):
+    """
+    Attach a ColoredFormatter's color codes to each record.
+
+    The codes are looked up by the integer levelno and stored on the record
+    as _color_pre/_color_post, so the formatter only concatenates. When the
+    formatter has colors disabled both are empty strings.
+    """
+
+    def __init__(self, formatter: ColoredFormatter):
+        super().__init__()
+        if formatter.use_color:
+            self._prefixes = {
+                logging.getLevelName(level): color
+                for level, color in formatter.COLORS.items()
+            }
+            self._suffix = formatter.RESET
+        else:
+            self._prefixes = {}
+            self._suffix = ""
+
+    def filter(self, record):
+        record._color_pre = self._prefixes.get(record.levelno, "")
+        record._color_post = self._suffix
+        return True
+
+
+class OrjsonFormatter(logging.Formatter):
+    """
+    Format records as single-line JSON objects (NDJSON) using orjson.
+
+    Each line holds the timestamp, level, logger name and message, plus the
+    fields of ``record.structured`` when the record came from StructuredLogger.
+    Records arrive through the QueueHandler, which has already folded any
+    traceback into the message.
+    """
+
+    def __init__(self, *args, **kwargs):
+        if orjson is None:
+            raise ImportError("orjson is required for JSON logging")
+        super().__init__(*args, **kwargs)
+
+    def format(self, record):
+        data = {
+            "ts": record.created,
+            "lvl": record.levelname,
+            "name": record.name,
+            "msg": record.getMessage(),
+        }
+        structured = getattr(record, "structured", None)
+        if structured:
+            data.update(structured)
+        return orjson.dumps(
+            data,
+            default=str,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+        ).decode()
+
+
+class FastRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    RotatingFileHandler that keeps its own count of bytes written.
+
+    The stock handler stats the log file, seeks to its end and formats the
+    record an extra time on every emit to decide whether to roll over. This
+    handler takes the size once when the file is opened and then adds the
+    encoded length of each record, so emit formats once and needs no
+    syscalls besides the write itself.
+    """
+
+    def _open(self):
+        return self._track_size(super()._open())
+
+    def _track_size(self, stream):
+        """Take the starting size of a freshly opened stream."""
+        info = os.fstat(stream.fileno())
+        # Devices and pipes (e.g. /dev/null) are never rolled over
+        self._bytes_written = info.st_size if stat.S_ISREG(info.st_mode) else None
+        return stream
+
+    def _encoded_size(self, msg: str) -> int:
+        """Size of msg in bytes once written with the handler's encoding."""
+        if msg.isascii():
+            return len(msg)
+        return len(msg.encode(self.encoding or "utf-8", self.errors or "strict"))
+
+    def shouldRollover(self, record) -> bool:
+        """Check whether writing record would exceed maxBytes."""
+        if self.stream is None:
+            self.stream = self._open()
+        if self.maxBytes <= 0 or self._bytes_written is None:
+            return False
+        size = self._encoded_size(self.format(record) + self.terminator)
+        return self._bytes_written + size >= self.maxBytes
+
+    def emit(self, record):
+        """Write record, rolling over first if it would exceed maxBytes."""
+        try:
+            self.write_message(self.format(record) + self.terminator)
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def write_message(self, msg: str):
+        """
+        Write an already formatted line, rolling over first if needed.
+
+        Callers other than emit() must hold the handler lock.
+        """
+        data, size = self._serialize(msg)
+        if self.stream is None:
+            self.stream = self._open()
+        if (
+            self.maxBytes > 0
+            and self._bytes_written is not None
+            and self._bytes_written + size >= self.maxBytes
+        ):
+            self.doRollover()
+        self.stream.write(data)
+        if self._bytes_written is not None:
+            self._bytes_written += size
+        self._written(size)
+
+    def _serialize(self, msg: str) -> Tuple[str, int]:
+        """Return what to write for msg and its size in bytes."""
+        return msg, self._encoded_size(msg)
+
+    def _written(self, size: int):
+        """Called after each record is written; flushes it straight away."""
+        self.flush()
+
+
+class BufferedRotatingFileHandler(FastRotatingFileHandler):
+    """
+    FastRotatingFileHandler that batches writes instead of flushing per record.
+
+    Records collect in a buffer of buffer_size bytes, which is flushed once it
+    fills or when a record arrives flush_interval seconds after the previous
+    flush. Rollover and close() always flush. Use FastRotatingFileHandler for
+    logs whose records must reach disk immediately.
+
+    The file is opened in binary mode and each record is encoded once and
+    copied straight into the writer's buffer, which is reused for the life of
+    the file, skipping the text layer's own chunk list.
+    """
+
+    def __init__(
+        self,
+        filename,
+        *args,
+        buffer_size: int = LOG_BUFFER_SIZE,
+        flush_interval: float = LOG_FLUSH_INTERVAL,
+        **kwargs,
+    ):
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        super().__init__(filename, *args, **kwargs)
+
+    def _open(self):
+        mode = self.mode if "b" in self.mode else self.mode + "b"
+        stream = open(self.baseFilename, mode, buffering=self.buffer_size)
+        return self._track_size(stream)
+
+    def _serialize(self, msg: str) -> Tuple[bytes, int]:
+        data = msg.encode(self.encoding or "utf-8", self.errors or "strict")
+        return data, len(data)
+
+    def _written(self, size: int):
+        self._pending += size
+        if (
+            self._pending >= self.buffer_size
+            or time.monotonic() - self._last_flush >= self.flush_interval
+        ):
+            self.flush()
+
+    def flush(self):
+        super().flush()
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+
+class MultiSinkHandler(logging.Handler):
+    """
+    Format each record once and write it to several file handlers.
+
+    Every sink keeps its own level and filters, but the formatting is done by
+    this handler and only when at least one sink accepts the record, so a
+    line that lands in both the main and error logs is formatted once.
+    """
+
+    def __init__(self, *sinks: FastRotatingFileHandler, level=logging.NOTSET):
+        super().__init__(level)
+        self.sinks = sinks
+
+    def emit(self, record):
+        try:
+            msg = None
+            for sink in self.sinks:
+                if record.levelno < sink.level or not sink.filter(record):
+                    continue
+                if msg is None:
+                    msg = self.format(record) + sink.terminator
+                sink.acquire()
+                try:
+                    sink.write_message(msg)
+                finally:
+                    sink.release()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        for sink in self.sinks:
+            sink.flush()
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+        super().close()
+
+
+class BatchQueueListener(logging.handlers.QueueListener):
+    """
+    QueueListener that drains records in batches.
+
+    Each wake-up handles everything already queued, up to batch_size records,
+    and then flushes the handlers once, so a burst of records reaches the
+    buffered file handlers as a few large writes instead of one per record.
+    """
+
+    def __init__(self, log_queue, *handlers, batch_size: int = LOG_BATCH_SIZE, **kwargs):
+        super().__init__(log_queue, *handlers, **kwargs)
+        self.batch_size = batch_size
+
+    def _monitor(self):
+        q = self.queue
+        has_task_done = hasattr(q, "task_done")
+        stopping = False
+        while not stopping:
+            batch = [q.get()]
+            try:
+                while len(batch) < self.batch_size:
+                    batch.append(q.get_nowait())
+            except queue.Empty:
+                pass
+            for record in batch:
+                if record is self._sentinel:
+                    stopping = True
+                else:
+                    self.handle(record)
+                if has_task_done:
+                    q.task_done()
+            for handler in self.handlers:
+                handler.flush()
+
+
+# Background threads writing the log files configured by setup_logging,
+# and the settings each logger was last configured with, keyed by app name
+_queue_listeners: Dict[str, logging.handlers.QueueListener] = {}
+_configured: Dict[str, Tuple[tuple, logging.Logger]] = {}
+
+
+def _stop_queue_listener(app_name: str):
+    """Drain and stop an app's background log writer and close its files."""
+    listener = _queue_listeners.pop(app_name, None)
+    if listener is not None:
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
+
+def _stop_queue_listeners():
+    """Drain and stop every background log writer."""
+    for app_name in list(_queue_listeners):
+        _queue_listeners[app_name].stop()
+        del _queue_listeners[app_name]
+
+
+atexit.register(_stop_queue_listeners)
+
+
+def _parse_size(size: str) -> int:
+    """Convert a size such as "10MB" to bytes."""
+    match = _SIZE_RE.match(str(size))
+    if match is None:
+        raise ValueError(f"Invalid log file size: {size!r}")
+    unit = match[2].upper() if match[2] else None
+    return int(match[1]) * _SIZE_UNITS[unit]
 
 
 def setup_logging(
@@ -34,86 +382,145 @@ def setup_logging(
     app_name: str = "trading_bot",
     max_file_size: str = "10MB",
     backup_count: int = 5,
+    json_logs: bool = False,
+    force: bool = False,
 ) -> logging.Logger:
     """
     Setup comprehensive logging system.
 
+    Calling it again with the same settings returns the already configured
+    logger without reopening its files.
+
     Args:
         level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         log_dir: Directory to store log files
         app_name: Application name for log files
         max_file_size: Maximum size per log file
         backup_count: Number of backup files to keep
+        json_logs: Also write every record to <app_name>.ndjson as JSON lines
+            (requires orjson)
+        force: Reconfigure even if the settings are unchanged
 
     Returns:
         Configured logger instance
     """
+    settings = (level, log_dir, max_file_size, backup_count, json_logs)
+    cached = _configured.get(app_name)
+    if cached is not None and cached[0] == settings and not force:
+        return cached[1]
+
     # Create log directory
     log_path = Path(log_dir)
     log_path.mkdir(exist_ok=True)
+    base_name = os.fspath(log_path / app_name)
 
-    # Convert max_file_size to bytes
-    size_units = {"B": 1, "KB": 1024, "MB": 1024**2, "GB": 1024**3}
-    if max_file_size.endswith(("B", "KB", "MB", "GB")):
-        for unit, multiplier in size_units.items():
-            if max_file_size.endswith(unit):
-                max_bytes = int(max_file_size[: -len(unit)]) * multiplier
-                break
-    else:
-        max_bytes = int(max_file_size)
+    max_bytes = _parse_size(max_file_size)
 
     # Configure root logger
     logger = logging.getLogger(app_name)
     logger.setLevel(getattr(logging, level.upper()))
 
     # Clear existing handlers
+    _stop_queue_listener(app_name)
+    for handler in logger.handlers:
+        handler.close()
     logger.handlers.clear()
 
+    # Shared by every handler so a record's message is interpolated once
+    # no matter how many handlers accept it
+    message_cache = MessageCacheFilter()
+
     # Console handler with colors
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(logging.INFO)
+    console_handler.addFilter(message_cache)
     console_format = ColoredFormatter(
         "%(asctime)s | %(levelname)-8s | %(name)s | %(message)s",
         datefmt="%Y-%m-%d %H:%M:%S",
     )
     console_handler.setFormatter(console_format)
+    console_handler.addFilter(_ColorTagger(console_format))
     logger.addHandler(console_handler)
 
     # Main log file with rotation
-    main_log_file = log_path / f"{app_name}.log"
-    main_handler = logging.handlers.RotatingFileHandler(
-        main_log_file, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+    main_handler = BufferedRotatingFileHandler(
+        base_name + ".log",
+        maxBytes=max_bytes,
+        backupCount=backup_count,
+        encoding="utf-8",
     )
     main_handler.setLevel(logging.DEBUG)
-    main_format = logging.Formatter(
-        "%(asctime)s | %(levelname)-8s | %(name)s | %(funcName)s:%(lineno)d | %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-    )
-    main_handler.setFormatter(main_format)
-    logger.addHandler(main_handler)
 
     # Trading-specific log file
-    trading_log_file = log_path / f"{app_name}_trading.log"
-    trading_handler = logging.handlers.RotatingFileHandler(
-        trading_log_file, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+    trading_handler = BufferedRotatingFileHandler(
+        base_name + "_trading.log",
+        maxBytes=max_bytes,
+        backupCount=backup_count,
+        encoding="utf-8",
     )
     trading_handler.setLevel(logging.INFO)
     trading_handler.addFilter(TradingLogFilter())
-    trading_handler.setFormatter(main_format)
-    logger.addHandler(trading_handler)
 
-    # Error log file
-    error_log_file = log_path / f"{app_name}_errors.log"
-    error_handler = logging.handlers.RotatingFileHandler(
-        error_log_file, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+    # Error log file, flushed on every record
+    error_handler = FastRotatingFileHandler(
+        base_name + "_errors.log",
+        maxBytes=max_bytes,
+        backupCount=backup_count,
+        encoding="utf-8",
     )
     error_handler.setLevel(logging.ERROR)
-    error_handler.setFormatter(main_format)
-    logger.addHandler(error_handler)
 
+    # The three log files share one format, applied once per record
+    file_handler = MultiSinkHandler(main_handler, trading_handler, error_handler)
+    file_handler.addFilter(message_cache)
+    file_handler.setFormatter(
+        logging.Formatter(
+            "%(asctime)s | %(levelname)-8s | %(name)s | %(funcName)s:%(lineno)d | %(message)s",
+            datefmt="%Y-%m-%d %H:%M:%S",
+        )
+    )
+
+    # File handlers run on a background thread; callers only enqueue records
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    handlers = [file_handler]
+
+    # Optional machine-readable copy of every record for log ingestion
+    if json_logs:
+        json_handler = BufferedRotatingFileHandler(
+            base_name + ".ndjson",
+            maxBytes=max_bytes,
+            backupCount=backup_count,
+            encoding="utf-8",
+        )
+        json_handler.setLevel(logging.DEBUG)
+        json_handler.setFormatter(OrjsonFormatter())
+        handlers.append(json_handler)
+
+    listener = BatchQueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    _queue_listeners[app_name] = listener
+
+    _configured[app_name] = (settings, logger)
     return logger
 
 
+class MessageCacheFilter(logging.Filter):
+    """
+    Interpolate a record's message once and store it back on the record.
+
+    The first handler to see the record replaces msg with the result of
+    getMessage() and clears args, so later filters and formatters reuse the
+    finished string instead of applying the % arguments again.
+    """
+
+    def filter(self, record):
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        return True
+
+
 class TradingLogFilter(logging.Filter):
     """Filter to capture only trading-related log messages."""
 
@@ -131,76 +538,150 @@ class TradingLogFilter(logging.Filter):
         "exit",
         "portfolio",
     ]
+    TRADING_REGEX = re.compile(
+        "|".join(map(re.escape, TRADING_KEYWORDS)), re.IGNORECASE
+    )
+
+    # Aho-Corasick automaton over the keywords when pyahocorasick is installed
+    if ahocorasick is not None:
+        TRADING_AUTOMATON = ahocorasick.Automaton()
+        for _keyword in TRADING_KEYWORDS:
+            TRADING_AUTOMATON.add_word(_keyword, _keyword)
+        TRADING_AUTOMATON.make_automaton()
+        del _keyword
+    else:
+        TRADING_AUTOMATON = None
 
     def filter(self, record):
         """Check if log record contains trading-related keywords."""
-        message = record.getMessage().lower()
-        return any(keyword in message for keyword in self.TRADING_KEYWORDS)
+        if self.TRADING_AUTOMATON is not None:
+            matches = self.TRADING_AUTOMATON.iter(record.getMessage().lower())
+            return next(matches, None) is not None
+        return self.TRADING_REGEX.search(record.getMessage()) is not None
 
 
 class PerformanceLogger:
     """Logger for performance metrics and timing."""
 
+    __slots__ = ("logger", "timers")
+
     def __init__(self, logger: logging.Logger):
         self.logger = logger
-        self.timers = {}
+        # (name, start_ns) pairs in start order; only a handful of timers are
+        # ever running and they are usually nested, so a list scanned from
+        # the end beats a dict
+        self.timers: List[Tuple[str, int]] = []
 
     def start_timer(self, name: str):
         """Start a performance timer."""
-        self.timers[name] = datetime.now()
+        timers = self.timers
+        if len(timers) >= MAX_TIMERS:
+            # Timers that were never ended; forget the oldest
+            del timers[0]
+        timers.append((sys.intern(name), time.perf_counter_ns()))
+
+    def _pop_timer(self, name: str):
+        """
+        Remove the most recently started timer called name.
+
+        Returns:
+            Its start time in nanoseconds, or _NO_TIMER if none is running
+        """
+        timers = self.timers
+        # Innermost timer first: the usual case for nested timers
+        if timers and timers[-1][0] == name:
+            return timers.pop()[1]
+        for i in range(len(timers) - 2, -1, -1):
+            if timers[i][0] == name:
+                return timers.pop(i)[1]
+        return _NO_TIMER
 
     def end_timer(self, name: str, message: Optional[str] = None):
         """End a performance timer and log the duration."""
-        if name not in self.timers:
-            self.logger.warning(f"Timer '{name}' was not started")
-            return
+        end = time.perf_counter_ns()
+        start = self._pop_timer(name)
+        if start is _NO_TIMER:
+            self.logger.warning("Timer '%s' was not started", name)
+            return None
+
+        duration = (end - start) * 1e-9
+        if self.logger.isEnabledFor(logging.DEBUG):
+            log_message = message or f"Timer '{name}' completed"
+            self.logger.debug("%s - Duration: %.3fs", log_message, duration)
+        return duration
 
-        duration = (datetime.now() - self.timers[name]).total_seconds()
-        log_message = message or f"Timer '{name}' completed"
-        self.logger.debug(f"{log_message} - Duration: {duration:.3f}s")
 
-        del self.timers[name]
-        return duration
+SIGNAL_FORMAT = "SIGNAL | %s | %s | Price: %.6f | Confidence: %.2f"
+TRADE_FORMAT = "TRADE | %s | %s | Qty: %.6f | Price: %.6f"
+POSITION_FORMAT = "POSITION | %s | PnL: %.2f | Status: %s"
+SYSTEM_FORMAT = "SYSTEM | CPU: %.1f%% | Memory: %.1f%% | Temp: %.1f°C"
 
 
 class StructuredLogger:
-    """Logger with structured data support."""
+    """
+    Logger with structured data support.
+
+    Messages are interpolated lazily by the logging framework, and a shallow
+    copy of the data dict is attached to the record as ``record.structured``
+    for handlers that want the fields rather than the text. The copy matters
+    because the queue listener serializes the record after the call returns.
+    """
 
     def __init__(self, logger: logging.Logger):
         self.logger = logger
 
     def log_trade_signal(self, signal_data: dict):
         """Log trading signal with structured data."""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        get = signal_data.get
         self.logger.info(
-            f"SIGNAL | {signal_data.get('type')} | "
-            f"{signal_data.get('symbol')} | "
-            f"Price: {signal_data.get('price', 0):.6f} | "
-            f"Confidence: {signal_data.get('confidence', 0):.2f}"
+            SIGNAL_FORMAT,
+            get("type"),
+            get("symbol"),
+            get("price", 0),
+            get("confidence", 0),
+            extra={"structured": dict(signal_data)},
         )
 
     def log_trade_execution(self, trade_data: dict):
         """Log trade execution with structured data."""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        get = trade_data.get
         self.logger.info(
-            f"TRADE | {trade_data.get('action')} | "
-            f"{trade_data.get('symbol')} | "
-            f"Qty: {trade_data.get('quantity', 0):.6f} | "
-            f"Price: {trade_data.get('price', 0):.6f}"
+            TRADE_FORMAT,
+            get("action"),
+            get("symbol"),
+            get("quantity", 0),
+            get("price", 0),
+            extra={"structured": dict(trade_data)},
         )
 
     def log_position_update(self, position_data: dict):
         """Log position update with structured data."""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        get = position_data.get
         self.logger.info(
-            f"POSITION | {position_data.get('symbol')} | "
-            f"PnL: {position_data.get('pnl', 0):.2f} | "
-            f"Status: {position_data.get('status')}"
+            POSITION_FORMAT,
+            get("symbol"),
+            get("pnl", 0),
+            get("status"),
+            extra={"structured": dict(position_data)},
         )
 
     def log_system_metrics(self, metrics: dict):
         """Log system performance metrics."""
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
+        get = metrics.get
         self.logger.debug(
-            f"SYSTEM | CPU: {metrics.get('cpu_usage', 0):.1f}% | "
-            f"Memory: {metrics.get('memory_usage', 0):.1f}% | "
-            f"Temp: {metrics.get('cpu_temp', 0):.1f}°C"
+            SYSTEM_FORMAT,
+            get("cpu_usage", 0),
+            get("memory_usage", 0),
+            get("cpu_temp", 0),
+            extra={"structured": dict(metrics)},
         )
 
 
@@ -0,0 +1,41 @@
+"""
+Tests for the momentum strategy on short histories.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.strategies.momentum import MomentumStrategy
+
+
+def make_ohlcv(n: int) -> pd.DataFrame:
+    rng = np.random.default_rng(3)
+    return pd.DataFrame({
+        'close': 100 + np.cumsum(rng.normal(0, 1, n)),
+        'volume': rng.uniform(1_000, 5_000, n),
+    })
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize('rows', [0, 1, 2])
+@pytest.mark.parametrize('float32', [False, True])
+def test_short_frames_give_nan_indicators(rows, float32):
+    strategy = MomentumStrategy({'float32_indicators': float32})
+    df = make_ohlcv(rows)
+
+    result = strategy.calculate_indicators(df)
+    assert len(result) == rows
+    assert result['roc'].isna().all()
+    assert result['rsi'].isna().all()
+
+    signals = strategy.generate_signals_batch(df)
+    assert signals.shape == (rows,)
+    assert not signals.any()
+
+
+@pytest.mark.unit
+def test_generate_signal_needs_momentum_period_bars():
+    strategy = MomentumStrategy()
+    df = make_ohlcv(strategy.momentum_period)
+    assert strategy.generate_signal('BTC/USDT', {}, df) is None
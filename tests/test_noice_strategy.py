@@ -0,0 +1,75 @@
+"""
+Tests for NOICEStrategy batched bar processing.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from src.core.market_data import OHLCVData
+from src.strategies.noice_strategy import NOICEStrategy
+
+
+def make_bars(n: int, seed: int = 1):
+    """Random-walk OHLCV bars one minute apart."""
+    rng = np.random.default_rng(seed)
+    close = np.abs(1 + np.cumsum(rng.normal(0, 0.01, n))) + 0.1
+    t0 = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    bars = []
+    for i in range(n):
+        open_ = close[i - 1] if i else close[i]
+        high = max(open_, close[i]) * (1 + abs(rng.normal(0, 0.003)))
+        low = min(open_, close[i]) * (1 - abs(rng.normal(0, 0.003)))
+        bars.append(
+            OHLCVData(
+                t0 + timedelta(minutes=i), open_, high, low, close[i],
+                rng.lognormal(3, 1), "NOICEUSDT",
+            )
+        )
+    return bars
+
+
+def signal_key(signal):
+    if signal is None:
+        return None
+    return (signal.signal_type, round(signal.confidence, 9), signal.price, signal.reason)
+
+
+def run(bars, batch_size, rate_limited=True):
+    strategy = NOICEStrategy()
+    strategy.parameters.min_confidence = 0.0
+    if not rate_limited:
+        strategy._is_rate_limited = lambda: False
+
+    if batch_size == 1:
+        signals = [strategy.update(bar) for bar in bars]
+    else:
+        signals = []
+        for i in range(0, len(bars), batch_size):
+            signals += strategy.update_batch(bars[i:i + batch_size])
+    return strategy, [signal_key(s) for s in signals]
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("batch_size", [7, 64, 600])
+@pytest.mark.parametrize("rate_limited", [True, False])
+def test_update_batch_matches_update(batch_size, rate_limited):
+    bars = make_bars(600)
+    expected_strategy, expected = run(bars, 1, rate_limited)
+    strategy, signals = run(bars, batch_size, rate_limited)
+
+    assert signals == expected
+    assert any(s is not None for s in signals)
+    assert len(strategy.data_buffer) == len(expected_strategy.data_buffer)
+    assert strategy.data_buffer[-1] is bars[-1]
+    assert len(strategy.signal_history) == len(expected_strategy.signal_history)
+
+
+@pytest.mark.unit
+def test_update_batch_warm_up_returns_none():
+    strategy = NOICEStrategy()
+    bars = make_bars(strategy.get_required_history() - 1)
+
+    assert strategy.update_batch(bars) == [None] * len(bars)
+    assert strategy.state.count == len(bars)
@@ -0,0 +1,65 @@
+"""
+Tests for the TradingEngine open position snapshot.
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from src.core.config_manager import ConfigManager
+from src.core.strategy_interface import SignalType, TradingSignal
+from src.core.trading_engine import TradingEngine
+
+
+def make_signal(symbol: str) -> TradingSignal:
+    return TradingSignal(
+        signal_type=SignalType.BUY,
+        symbol=symbol,
+        price=100.0,
+        quantity=1.0,
+        stop_loss=95.0,
+        take_profit_1=110.0,
+        take_profit_2=120.0,
+        confidence=0.9,
+        reason="test",
+        timestamp=datetime.now(tz=timezone.utc),
+    )
+
+
+@pytest.fixture
+def engine():
+    return TradingEngine(ConfigManager())
+
+
+@pytest.mark.unit
+def test_position_symbols_cached_between_changes(engine):
+    risk_manager = engine.risk_manager
+    risk_manager.open_position(make_signal("AAA"), 1.0)
+
+    symbols = engine._position_symbols()
+    assert symbols == ("AAA",)
+    assert engine._position_symbols() is symbols
+
+    # Price updates do not change the set of symbols
+    risk_manager.update_position("AAA", 101.0)
+    assert engine._position_symbols() is symbols
+
+
+@pytest.mark.unit
+def test_position_symbols_rebuilt_after_open_and_close(engine):
+    risk_manager = engine.risk_manager
+    assert engine._position_symbols() == ()
+
+    version = risk_manager.positions_version
+    risk_manager.open_position(make_signal("AAA"), 1.0)
+    risk_manager.open_position(make_signal("BBB"), 1.0)
+    assert risk_manager.positions_version != version
+    assert engine._position_symbols() == ("AAA", "BBB")
+
+    version = risk_manager.positions_version
+    risk_manager.close_position("AAA", "test")
+    assert risk_manager.positions_version != version
+    assert engine._position_symbols() == ("BBB",)
+
+    risk_manager.close_position("BBB", "test")
+    assert engine._position_symbols() == ()
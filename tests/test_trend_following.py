@@ -0,0 +1,123 @@
+"""
+Tests for the TrendFollowing per-symbol indicator state.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.strategies.trend_following import TrendFollowingStrategy
+
+INDICATORS = ['fast_ma', 'slow_ma', 'rsi', 'volume_ma', 'trend_strength']
+
+
+def make_ohlcv(n: int, seed: int = 7) -> pd.DataFrame:
+    """Random-walk close prices with random volumes on a RangeIndex."""
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    volume = rng.uniform(1_000, 5_000, n)
+    return pd.DataFrame({'close': close, 'volume': volume})
+
+
+def assert_state_matches(strategy: TrendFollowingStrategy, df: pd.DataFrame):
+    """The streaming state for df must equal calculate_indicators on df."""
+    state = strategy._update_state('BTC/USDT', df)
+    expected = strategy.calculate_indicators(df).iloc[-1]
+    for name in INDICATORS:
+        assert state.current[name] == pytest.approx(
+            expected[name], rel=1e-9, nan_ok=True
+        ), name
+
+
+@pytest.fixture
+def strategy():
+    return TrendFollowingStrategy({'fast_period': 5, 'slow_period': 20})
+
+
+@pytest.mark.unit
+def test_growing_history_pushes_one_bar(strategy):
+    df = make_ohlcv(120)
+    assert_state_matches(strategy, df.iloc[:100])
+    state = strategy._state['BTC/USDT']
+    for end in range(101, 121):
+        assert_state_matches(strategy, df.iloc[:end])
+    # Each call only extended the same state
+    assert strategy._state['BTC/USDT'] is state
+
+
+@pytest.mark.unit
+def test_last_bar_revised_in_place(strategy):
+    df = make_ohlcv(100)
+    assert_state_matches(strategy, df)
+
+    df.loc[df.index[-1], 'close'] *= 1.05
+    assert_state_matches(strategy, df)
+
+    df.loc[df.index[-1], 'volume'] *= 3
+    assert_state_matches(strategy, df)
+
+
+@pytest.mark.unit
+def test_sliding_fixed_length_window(strategy):
+    df = make_ohlcv(200)
+    for start in range(0, 100, 7):
+        window = df.iloc[start:start + 100].reset_index(drop=True)
+        assert_state_matches(strategy, window)
+
+
+@pytest.mark.unit
+def test_sliding_window_with_timestamps(strategy):
+    df = make_ohlcv(200)
+    df['timestamp'] = pd.date_range('2024-01-01', periods=len(df), freq='min')
+    for start in range(0, 100, 7):
+        assert_state_matches(strategy, df.iloc[start:start + 100])
+
+
+@pytest.mark.unit
+def test_lru_states_follow_their_own_history(strategy, monkeypatch):
+    monkeypatch.setattr(
+        'src.strategies.trend_following.MAX_TRACKED_SYMBOLS', 2
+    )
+    frames = {symbol: make_ohlcv(150, seed) for seed, symbol in enumerate('ABC')}
+
+    for end in range(100, 110):
+        for symbol, df in frames.items():
+            window = df.iloc[end - 100:end].reset_index(drop=True)
+            state = strategy._update_state(symbol, window)
+            expected = strategy.calculate_indicators(window).iloc[-1]
+            for name in INDICATORS:
+                assert state.current[name] == pytest.approx(
+                    expected[name], rel=1e-9, nan_ok=True
+                ), (symbol, name)
+        assert list(strategy._state) == ['B', 'C']
+
+
+@pytest.mark.unit
+def test_float32_indicators_is_batch_only():
+    config = {'fast_period': 5, 'slow_period': 20}
+    f64 = TrendFollowingStrategy(config)
+    f32 = TrendFollowingStrategy({**config, 'float32_indicators': True})
+    df = make_ohlcv(400)
+
+    # Batch indicators are float32 but stay within float32 rounding
+    ind64 = f64.calculate_indicators(df)
+    ind32 = f32.calculate_indicators(df)
+    assert ind32['fast_ma'].dtype == np.float32
+    np.testing.assert_allclose(ind32['fast_ma'], ind64['fast_ma'], rtol=1e-5)
+    np.testing.assert_allclose(ind32['slow_ma'], ind64['slow_ma'], rtol=1e-5)
+
+    # The live path ignores the flag: its state is the float64 one
+    for end in range(300, 400):
+        state = f32._update_state('BTC/USDT', df.iloc[:end])
+        expected = ind64.iloc[end - 1]
+        for name in INDICATORS:
+            assert state.current[name] == pytest.approx(
+                expected[name], rel=1e-9, nan_ok=True
+            ), name
+
+    # Batch codes only differ where the MAs are within float32 rounding
+    codes64 = f64.generate_signals_batch(df)
+    codes32 = f32.generate_signals_batch(df)
+    gap = np.abs(ind64['fast_ma'] - ind64['slow_ma']) / ind64['slow_ma']
+    close_call = (gap < 1e-5) | (gap.shift(1) < 1e-5)
+    assert (codes64 == codes32)[~close_call.to_numpy()].all()